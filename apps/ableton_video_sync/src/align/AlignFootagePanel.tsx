@@ -16,11 +16,13 @@ const formatSeconds = (value?: number | null) =>
 
 export function AlignFootagePanel({ activeProjectPath }: AlignFootagePanelProps) {
   const [audioPath, setAudioPath] = useState('')
+  const [debug, setDebug] = useState(false)
   const [running, setRunning] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const [message, setMessage] = useState<string | null>(null)
   const [result, setResult] = useState<AlignFootageResult | null>(null)
   const [loadingState, setLoadingState] = useState(false)
+  const [loadingDebug, setLoadingDebug] = useState(false)
 
   useEffect(() => {
     if (!activeProjectPath) {
@@ -60,7 +62,7 @@ export function AlignFootagePanel({ activeProjectPath }: AlignFootagePanelProps)
     setMessage(null)
 
     try {
-      const payload = await runFootageAlignment(activeProjectPath, audioPath)
+      const payload = await runFootageAlignment(activeProjectPath, audioPath, debug)
       setResult(payload)
       setMessage(`Aligned ${payload.segments_aligned} segment(s).`)
     } catch (err) {
@@ -71,6 +73,22 @@ export function AlignFootagePanel({ activeProjectPath }: AlignFootagePanelProps)
     }
   }
 
+  const handleLoadDebug = async () => {
+    if (!activeProjectPath) return
+
+    setLoadingDebug(true)
+    setError(null)
+
+    try {
+      setResult(await fetchAlignState(activeProjectPath, true))
+    } catch (err) {
+      console.error(err)
+      setError(err instanceof Error ? err.message : 'Failed to load debug details.')
+    } finally {
+      setLoadingDebug(false)
+    }
+  }
+
   if (!activeProjectPath) {
     return (
       <section className="placeholder-panel">
@@ -114,6 +132,15 @@ export function AlignFootagePanel({ activeProjectPath }: AlignFootagePanelProps)
           placeholder="D:\\path\\to\\mixdown.wav"
           disabled={running}
         />
+        <label className="checkbox-row">
+          <input
+            type="checkbox"
+            checked={debug}
+            onChange={(event) => setDebug(event.target.checked)}
+            disabled={running}
+          />
+          <span>Collect debug details</span>
+        </label>
       </div>
 
       {error && <p className="inline-message inline-message--error">{error}</p>}
@@ -197,7 +224,12 @@ export function AlignFootagePanel({ activeProjectPath }: AlignFootagePanelProps)
           </table>
 
           {/* DEBUG */}
-          {result.debug?.length > 0 && (
+          {result.debug_file && (result.debug?.length ?? 0) === 0 && (
+            <button className="ghost-button" type="button" onClick={handleLoadDebug} disabled={loadingDebug}>
+              {loadingDebug ? 'Loading debug details…' : `Load debug details (${result.debug_file.count} rows)`}
+            </button>
+          )}
+          {(result.debug?.length ?? 0) > 0 && (
             <div className="align-debug">
               <h4>Debug details</h4>
               <pre>{JSON.stringify(result.debug, null, 2)}</pre>
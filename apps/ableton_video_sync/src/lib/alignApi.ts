@@ -31,7 +31,8 @@ async function handleResponse<T>(response: Response): Promise<T> {
 
 export function runFootageAlignment(
   projectPath: string,
-  audioPath?: string
+  audioPath?: string,
+  debug?: boolean
 ): Promise<AlignFootageResult> {
   if (!projectPath) {
     return Promise.reject(new Error("Select an active project first."));
@@ -42,17 +43,20 @@ export function runFootageAlignment(
     body: JSON.stringify({
       project_path: projectPath,
       audio_path: audioPath?.trim() || undefined,
+      debug: debug || undefined,
     }),
   }).then(handleResponse);
 }
 
 export function fetchAlignState(
-  projectPath: string
+  projectPath: string,
+  includeDebug?: boolean
 ): Promise<AlignFootageResult> {
   if (!projectPath) {
     return Promise.reject(new Error("Select an active project first."));
   }
+  const query = includeDebug ? "&include_debug=true" : "";
   return fetch(
-    `${API_BASE}/align/state?project_path=${encodeURIComponent(projectPath)}`
+    `${API_BASE}/align/state?project_path=${encodeURIComponent(projectPath)}${query}`
   ).then(handleResponse);
 }
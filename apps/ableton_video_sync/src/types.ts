@@ -34,5 +34,6 @@ export type AlignFootageResult = {
   output_dir: string;
   segments_aligned: number;
   results: AlignSegmentResult[];
-  debug: any[];
+  debug?: any[]; // only present when the run was started with debug
+  debug_file?: { path: string; count: number }; // set when debug rows were written to debug.jsonl
 };
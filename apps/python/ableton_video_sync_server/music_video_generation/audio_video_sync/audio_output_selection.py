@@ -20,14 +20,19 @@ class AudioOutputSelector:
         "monitor",
         "tv",
     ]
+    _SCREEN_RE = re.compile("|".join(map(re.escape, SCREEN_KEYWORDS)), re.IGNORECASE)
 
     def __init__(self):
         if sd is None:
             raise RuntimeError("sounddevice nicht installiert. Bitte 'pip install sounddevice' ausfhren.")
         self.devices = sd.query_devices()
         self.hostapi_names = [api["name"].lower() for api in sd.query_hostapis()]
+        self._outputs = self._build_outputs()
 
     def list_outputs(self) -> list[dict]:
+        return list(self._outputs)
+
+    def _build_outputs(self) -> list[dict]:
         outputs = []
         for idx, dev in enumerate(self.devices):
             if dev["max_output_channels"] > 0:
@@ -41,13 +46,12 @@ class AudioOutputSelector:
 
     def print_outputs(self) -> None:
         print("\nVerfgbare Audio-Ausgnge:")
-        for o in self.list_outputs():
+        for o in self._outputs:
             print(f"[{o['index']:2d}] {o['name']}  ({o['channels']}ch)  via {o['hostapi']}")
 
     def find_screen_output(self) -> dict | None:
-        pattern = re.compile("|".join(self.SCREEN_KEYWORDS), re.IGNORECASE)
-        for o in self.list_outputs():
-            if pattern.search(o["name"]):
+        for o in self._outputs:
+            if self._SCREEN_RE.search(o["name"]):
                 return o
         return None
 
@@ -1,9 +1,12 @@
 # cue_player_singleton.py
-import os, sys, time, wave, ctypes, platform
+import io, os, sys, wave, ctypes, platform
 import numpy as np
 from typing import Optional
 from dataclasses import dataclass
+from functools import lru_cache
 import threading
+import queue
+import traceback
 
 # -------------------- CONFIG --------------------
 FS = 48000
@@ -19,25 +22,54 @@ VK_ESCAPE = 0x1B
 # Optional: backend env override
 BACKEND_ENV = os.environ.get("CUE_BACKEND", "").lower().strip() or None
 
+# Glaettungskern (Hann, 64 Taps) fuer unique_cue
+HANN64 = np.hanning(64) / 64
+
 
 # ============================================================
 # Utility: fade in/out and simple chirps
 # ============================================================
-def fade(x: np.ndarray, ms=FADE_MS, fs=FS):
-    n = max(1, int(ms * fs / 1000))
+@lru_cache(maxsize=32)
+def _ramp(n: int) -> np.ndarray:
+    # Fade-Rampe 0..1, pro Laenge nur einmal erzeugt (read-only)
     r = np.linspace(0, 1, n, dtype=np.float32)
+    r.setflags(write=False)
+    return r
+
+
+def fade(x: np.ndarray, ms=FADE_MS, fs=FS):
+    # n auf die Signallaenge begrenzen, sonst passen Rampe und Slice nicht zusammen
+    n = min(max(1, int(ms * fs / 1000)), x.shape[0])
+    r = _ramp(n)
     x[:n] *= r
     x[-n:] *= r[::-1]
     return x
 
 
 def to_stereo(x: np.ndarray) -> np.ndarray:
-    y = np.clip(x * PEAK, -1, 1).astype(np.float32)
-    return np.column_stack((y, y))
+    y = np.clip(x * PEAK, -1, 1)
+    # beide Kanaele direkt in einen C-kontiguierlichen float32-Puffer schreiben
+    stereo = np.empty((y.shape[0], 2), dtype=np.float32)
+    stereo[:, 0] = y
+    stereo[:, 1] = y
+    return stereo
 
 
 def stereo_to_pcm(stereo: np.ndarray) -> bytes:
-    return (np.clip(stereo, -1, 1) * 32767).astype(np.int16).tobytes()
+    scaled = np.clip(stereo, -1, 1)
+    scaled *= 32767
+    return scaled.astype(np.int16).tobytes()
+
+
+def wav_bytes(pcm: bytes, samplerate=FS) -> bytes:
+    """16-bit Stereo-WAV im Speicher (fuer winsound.SND_MEMORY)."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(samplerate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
 
 
 # ============================================================
@@ -53,17 +85,18 @@ def unique_cue(seed: int, length=1.3, fs=FS) -> np.ndarray:
     """
     rng = np.random.default_rng(seed)
     n_total = int(length * fs)
-    t = np.linspace(0, length, n_total, endpoint=False, dtype=np.float32)
 
     # A-Blues + Oktavsprnge
     blues = np.array([220.0, 261.63, 293.66, 311.13, 329.63, 392.0])
     note_pool = np.concatenate([blues, blues * 2, blues * 0.5])
-    tone = np.zeros_like(t)
+    tone = np.zeros(n_total, dtype=np.float32)
 
     # Random: Anzahl und Positionen kurzer Noten
     num_notes = rng.integers(3, 6)
     note_starts = np.sort(rng.choice(np.linspace(0, length - 0.2, 20), num_notes, replace=False))
     note_durs = rng.uniform(0.05, 0.25, size=num_notes)
+    # gemeinsamer Sample-Index; arange(n) * (dur / n) == linspace(0, dur, n, endpoint=False)
+    idx = np.arange(int(fs * note_durs.max()), dtype=np.float64)
 
     for i in range(num_notes):
         start_t = note_starts[i]
@@ -71,8 +104,10 @@ def unique_cue(seed: int, length=1.3, fs=FS) -> np.ndarray:
         f = rng.choice(note_pool) * rng.uniform(0.9, 1.1)
 
         # Kurze, leicht gefilterte Wellen (Sinus + leicht verzerrt)
-        note_t = np.linspace(0, dur, int(fs * dur), endpoint=False)
-        w = np.sin(2 * np.pi * f * note_t) * (0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(2, 5) * note_t))
+        n_note = int(fs * dur)
+        note_t = idx[:n_note] * (dur / n_note)
+        w = np.sin(2 * np.pi * f * note_t)
+        w *= 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(2, 5) * note_t)
         w += 0.3 * np.sin(2 * np.pi * 2 * f * note_t)
         w = fade(w, ms=FADE_MS, fs=fs)
 
@@ -86,14 +121,13 @@ def unique_cue(seed: int, length=1.3, fs=FS) -> np.ndarray:
 
     # sanfter Gesamt-Fade, Normalisierung
     tone = fade(tone, ms=FADE_MS * 2)
-    tone /= np.max(np.abs(tone) + 1e-6)
+    tone /= np.max(np.abs(tone)) + 1e-6
 
     # leicht dumpfer oder heller Filter je Seed
     if rng.random() < 0.5:
-        tone = np.convolve(tone, np.hanning(64) / 64, mode="same")
+        tone = np.convolve(tone, HANN64, mode="same")
     else:
-        smooth = np.convolve(tone, np.hanning(64) / 64, mode="same")
-        tone -= smooth * 0.2
+        tone -= np.convolve(tone, HANN64, mode="same") * 0.2
 
     return tone.astype(np.float32)
 
@@ -110,18 +144,34 @@ def mk_barker_bpsk(chip_ms: float = 18.0, carrier_hz: float = 3000.0, fs: int =
     """
     barker = np.array([+1, +1, +1, +1, +1, -1, -1, +1, +1, -1, +1, -1, +1], dtype=np.float32)
     chip_n = max(1, int(round(fs * (chip_ms / 1000.0))))
-    t_chip = np.linspace(0.0, chip_ms / 1000.0, chip_n, endpoint=False, dtype=np.float32)
+    # == np.linspace(0, chip_ms / 1000, chip_n, endpoint=False, dtype=np.float32)
+    t_chip = (np.arange(chip_n) * (chip_ms / 1000.0 / chip_n)).astype(np.float32)
     carrier = np.sin(2 * np.pi * carrier_hz * t_chip).astype(np.float32)
 
-    parts = [(bit * carrier) for bit in barker]
-    x = np.concatenate(parts).astype(np.float32)
+    # chip i = barker[i] * carrier, written row by row into one buffer
+    x = np.outer(barker, carrier).ravel()
     x = fade(x, ms=FADE_MS)
     # light normalization
     peak = float(np.max(np.abs(x)) + 1e-6)
-    x = (x / peak).astype(np.float32)
+    x /= peak
     return x
 
 
+# Seeds und Barker-Parameter wiederholen sich beim Abspielen: einmal erzeugen, read-only cachen
+@lru_cache(maxsize=128)
+def _seed_cue(seed: int, dur: float) -> np.ndarray:
+    mono = unique_cue(seed, length=dur)
+    mono.setflags(write=False)
+    return mono
+
+
+@lru_cache(maxsize=16)
+def _barker_cue(chip_ms: float, carrier_hz: float, fs: int) -> np.ndarray:
+    mono = mk_barker_bpsk(chip_ms=chip_ms, carrier_hz=carrier_hz, fs=fs)
+    mono.setflags(write=False)
+    return mono
+
+
 
 
 
@@ -129,6 +179,18 @@ def mk_barker_bpsk(chip_ms: float = 18.0, carrier_hz: float = 3000.0, fs: int =
 # ============================================================
 # Singleton Cue Player
 # ============================================================
+_JOBS_LOCK = threading.Lock()
+
+
+def _run_jobs(jobs):
+    while True:
+        job = jobs.get()
+        try:
+            job()
+        except Exception:
+            traceback.print_exc()
+
+
 @dataclass
 class CuePlayer:
     device_index: Optional[int] = None
@@ -140,6 +202,7 @@ class CuePlayer:
     sa = None
     winsound = None
     fs_out = FS
+    _jobs = None
 
     # ------------- Singleton Accessor -------------
     @classmethod
@@ -187,22 +250,33 @@ class CuePlayer:
             self.sa.WaveObject(pcm, num_channels=2, bytes_per_sample=2, sample_rate=samplerate).play().wait_done()
         elif self.backend_name == "winsound":
             pcm = stereo_to_pcm(stereo)
-            tmp = os.path.join(REF_DIR, f"_tmp_{time.time_ns()}.wav")
-            os.makedirs(REF_DIR, exist_ok=True)
-            with wave.open(tmp, "wb") as wf:
-                wf.setnchannels(2)
-                wf.setsampwidth(2)
-                wf.setframerate(samplerate)
-                wf.writeframes(pcm)
-            self.winsound.PlaySound(tmp, self.winsound.SND_FILENAME)
+            # SND_MEMORY plays from a RIFF buffer (synchronously; winsound has no async memory playback)
+            self.winsound.PlaySound(wav_bytes(pcm, samplerate), self.winsound.SND_MEMORY)
         else:
             raise RuntimeError("No valid backend loaded.")
 
+    # ------------- Hintergrund-Wiedergabe -------------
+    def _submit(self, job):
+        """
+        Nicht-blockierende Cues in eine Queue stellen; ein Daemon-Thread pro
+        Player spielt sie der Reihe nach ab (kein Thread-Start pro Cue).
+
+        Cues überlappen sich nicht und werden nicht abgeschnitten: ein Cue,
+        der während eines laufenden kommt, startet erst nach diesem (und
+        allem, was davor in der Queue steht). Für exakt getimte Marker also
+        keinen Cue auslösen, solange der vorige noch spielen kann.
+        """
+        with _JOBS_LOCK:
+            if self._jobs is None:
+                self._jobs = queue.SimpleQueue()
+                threading.Thread(target=_run_jobs, args=(self._jobs,), name="cue-player", daemon=True).start()
+        self._jobs.put(job)
+
     # ------------- Deterministic play by seed -------------
 
     def play_seed(self, seed: int, dur=0.5, blocking=False, gain: float = 1.0):
         def _job():
-            mono = unique_cue(seed, length=dur)
+            mono = _seed_cue(seed, dur)
             stereo = to_stereo(mono)
             if gain != 1.0:
                 stereo = np.clip(stereo * float(gain), -1.0, 1.0)
@@ -211,7 +285,7 @@ class CuePlayer:
         if blocking:
             _job()
         else:
-            threading.Thread(target=_job, daemon=True).start()
+            self._submit(_job)
 
     # ------------- Deterministic play by musical bar -------------
     def play_bar(self, bar_index: int, total_bars: int, dur=0.5):
@@ -225,7 +299,7 @@ class CuePlayer:
     # ------------- Barker-13 BPSK marker playback -------------
     def play_barker(self, chip_ms: float = 18.0, carrier_hz: float = 3000.0, gain: float = 1.0, blocking: bool = True):
         def _job():
-            mono = mk_barker_bpsk(chip_ms=chip_ms, carrier_hz=carrier_hz, fs=self.fs_out)
+            mono = _barker_cue(chip_ms, carrier_hz, self.fs_out)
             stereo = to_stereo(mono)
             if gain != 1.0:
                 stereo = np.clip(stereo * float(gain), -1.0, 1.0)
@@ -234,7 +308,7 @@ class CuePlayer:
         if blocking:
             _job()
         else:
-            threading.Thread(target=_job, daemon=True).start()
+            self._submit(_job)
 
 
 # ============================================================
@@ -182,9 +182,10 @@ def fade(x: np.ndarray, ms: float = FADE_MS, fs: int = FS) -> np.ndarray:
 
 # ---------------- detection helpers ----------------
 def norm(x):
+    # one centered copy scaled in place (np.std would center a second copy)
     x = x - np.mean(x)
-    s = np.std(x) + 1e-8
-    return x / s
+    x /= np.sqrt(np.mean(x * x)) + 1e-8
+    return x
 
 
 def xcorr_valid(ref, rec):
@@ -338,8 +339,7 @@ def mk_barker_bpsk(chip_ms: float, carrier_hz: float, fs: int = FS) -> np.ndarra
     chip_n = max(1, int(round(fs * (chip_ms / 1000.0))))
     t_chip = np.linspace(0.0, chip_ms / 1000.0, chip_n, endpoint=False, dtype=np.float32)
     carrier = np.sin(2 * np.pi * carrier_hz * t_chip).astype(np.float32)
-    parts = [(bit * carrier) for bit in barker]
-    x = np.concatenate(parts).astype(np.float32)
+    x = np.outer(barker, carrier).ravel()
     # Soft fade avoids spurious peaks at edges
     return fade(x, ms=FADE_MS * 2, fs=fs)
 
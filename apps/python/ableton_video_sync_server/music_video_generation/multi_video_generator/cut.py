@@ -4,7 +4,7 @@ from typing import List, Optional
 from .model import Video, VideoProject
 
 
-@dataclass
+@dataclass(slots=True)
 class CutClip:
     time_global: float
     duration: float
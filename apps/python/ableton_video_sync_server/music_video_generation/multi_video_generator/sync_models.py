@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncRecording:
     project_name: str
     bpm: float
@@ -17,13 +17,13 @@ class SyncRecording:
     loop_end_bar: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CueAnchor:
     time_s: float
     ref_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraTake:
     file: Path
     window_start_s: float
@@ -35,7 +35,7 @@ class CameraTake:
     track_names: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioCueInfo:
     file: Path
     duration_s: float
@@ -43,7 +43,7 @@ class AudioCueInfo:
     end_hit: Optional[CueAnchor]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GridSlot:
     index: int
     time_global: float
@@ -51,7 +51,7 @@ class GridSlot:
     bar_index: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimpleVideoRef:
     filename: str
     camera_id: Optional[str] = None
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_right
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
 from .cut import CutClip
@@ -16,6 +18,72 @@ from .sync_metadata import _build_bar_grid, _bar_duration_s
 
 log = logging.getLogger(__name__)
 
+# Penalty subtracted from the ranking score of the previous slot's take when
+# alternating (bars_per_cut == 1). Scores live in [0.7, 6.0] (clamped solo
+# weight minus boundary penalty), so this always lets a different take win
+# while keeping the previous take as a fallback when it is the only option.
+_REPEAT_TAKE_PENALTY = 10.0
+
+# Shared filler reference for slots no camera covers; the renderer
+# special-cases kind == "black" and never opens the dummy path.
+_BLACK_REF = SimpleVideoRef(filename="__BLACK__", kind="black")
+
+
+@dataclass(slots=True)
+class TakeInfo:
+    """
+    Per-take metadata precomputed once before the slot loop.
+    """
+    take: CameraTake
+    order: int  # position in camera_takes; breaks score ties like the old scan order
+    take_index: int
+    window_start_s: float
+    window_end_s: float
+    anchor_time_s: float
+    duration_s: float
+    audio_cov_start: float
+    audio_cov_end: float
+    solo_weight: float
+    file_str: str
+    video_ref: SimpleVideoRef  # shared by every clip cut from this take
+
+
+def _make_take_info(
+    order: int,
+    t: CameraTake,
+    take_dur: float,
+    audio_start_t: float,
+    audio_duration: float,
+) -> TakeInfo:
+    """
+    Build TakeInfo for a take with a positive window (take_dur > 0).
+    """
+    # Audio coverage: the part of the song that this take actually covers
+    # if we align cue-start to cue-start.
+    audio_cov_end = min(audio_start_t + take_dur, audio_duration)
+
+    # Solo weighting: shorter windows get *more* weight.
+    # Example: if song is 25s and the take is only 8s, weight ~ 3.1
+    solo_weight = audio_duration / take_dur
+    # Avoid insane weights
+    solo_weight = max(1.0, min(solo_weight, 6.0))
+
+    file_str = str(t.file)
+    return TakeInfo(
+        take=t,
+        order=order,
+        take_index=t.index,
+        window_start_s=t.window_start_s,
+        window_end_s=t.window_end_s,
+        anchor_time_s=t.start_anchor.time_s,
+        duration_s=take_dur,
+        audio_cov_start=audio_start_t,
+        audio_cov_end=audio_cov_end,
+        solo_weight=solo_weight,
+        file_str=file_str,
+        video_ref=SimpleVideoRef(filename=file_str),
+    )
+
 
 def _build_sync_sequence(
     rec: SyncRecording,
@@ -25,7 +93,8 @@ def _build_sync_sequence(
     bars_per_cut: int,
     cut_length_override_s: Optional[float] = None,
     custom_duration_s: Optional[float] = None,
-) -> Tuple[List[CutClip], Dict[str, Any]]:
+    build_debug_plan: bool = True,
+) -> Tuple[List[CutClip], Optional[Dict[str, Any]]]:
     """
     Build a list of CutClip objects mapping audio beat-grid slots into multiple
     camera takes.
@@ -39,6 +108,9 @@ def _build_sync_sequence(
             actually covered by that window (no infinite reuse).
           * Give *shorter* windows more weight (solo clips) so they win when
             they overlap.
+
+    When ``build_debug_plan`` is False the per-slot plan entries and the
+    debug plan dict are skipped entirely and ``None`` is returned instead.
     """
     if not camera_takes:
         raise ValueError("No camera takes found - cannot build sync edit without video")
@@ -54,7 +126,9 @@ def _build_sync_sequence(
     # Then bar b occurs at:
     #   t_audio(b) = audio_start_t + (b - rec.start_bar) * bar_len
     audio_start_t = audio.start_anchor.time_s
-    audio_loop_start_t = audio_start_t + (rec.loop_start_bar - rec.start_bar) * bar_len
+    audio_start_ref = audio.start_anchor.ref_id
+    loop_start_bar = rec.loop_start_bar
+    audio_loop_start_t = audio_start_t + (loop_start_bar - rec.start_bar) * bar_len
 
     if audio_loop_start_t >= audio_duration:
         raise ValueError(
@@ -78,88 +152,105 @@ def _build_sync_sequence(
     # -----------------------------------------------------------------------
     # Precompute per-take metadata: duration, solo weight, audio coverage
     # -----------------------------------------------------------------------
-    take_infos: List[Dict[str, Any]] = []
-    for t in camera_takes:
-        take_dur = t.window_end_s - t.window_start_s
-        if take_dur <= 0:
-            continue
-
-        # Audio coverage: the part of the song that this take actually covers
-        # if we align cue-start to cue-start.
-        audio_cov_start = audio_start_t
-        audio_cov_end = min(audio_start_t + take_dur, audio_duration)
-        if audio_cov_end <= audio_cov_start:
-            log.warning(
-                "Camera take idx=%d file=%s has no positive audio coverage; "
-                "take_dur=%.3fs, audio_dur=%.3fs",
-                t.index,
-                t.file,
-                take_dur,
-                audio_duration,
-            )
-            continue
-
-        # Solo weighting: shorter windows get *more* weight.
-        # Example: if song is 25s and the take is only 8s, weight ~ 3.1
-        solo_weight = audio_duration / take_dur
-        # Avoid insane weights
-        solo_weight = max(1.0, min(solo_weight, 6.0))
-
-        take_infos.append(
-            {
-                "take": t,
-                "duration_s": take_dur,
-                "audio_cov_start": audio_cov_start,
-                "audio_cov_end": audio_cov_end,
-                "solo_weight": solo_weight,
-            }
+    take_infos: List[TakeInfo] = [
+        _make_take_info(order, t, take_dur, audio_start_t, audio_duration)
+        for order, t in enumerate(camera_takes)
+        if (take_dur := t.window_end_s - t.window_start_s) > 0
+    ]
+
+    no_coverage = [info for info in take_infos if info.audio_cov_end <= info.audio_cov_start]
+    if no_coverage:
+        log.warning(
+            "Camera takes without positive audio coverage (audio_dur=%.3fs): %s",
+            audio_duration,
+            ", ".join(
+                "idx=%d file=%s take_dur=%.3fs" % (info.take_index, info.file_str, info.duration_s)
+                for info in no_coverage
+            ),
         )
+        take_infos = [info for info in take_infos if info.audio_cov_end > info.audio_cov_start]
 
     if not take_infos:
         raise ValueError("No usable camera takes after coverage analysis")
 
-    log.info("Camera coverage / weights:")
-    for info in take_infos:
-        t: CameraTake = info["take"]
-        log.info(
-            "  file=%s idx=%d take_dur=%.3fs, audio_cov=[%.3f, %.3f], solo_weight=%.2f",
-            t.file,
-            t.index,
-            info["duration_s"],
-            info["audio_cov_start"],
-            info["audio_cov_end"],
-            info["solo_weight"],
-        )
-
-    seq: List[CutClip] = []
-    plan_segments: List[Dict[str, Any]] = []
+    if log.isEnabledFor(logging.INFO):
+        lines = ["Camera coverage / weights:"]
+        for info in take_infos:
+            lines.append(
+                "  file=%s idx=%d take_dur=%.3fs, audio_cov=[%.3f, %.3f], solo_weight=%.2f"
+                % (
+                    info.file_str,
+                    info.take_index,
+                    info.duration_s,
+                    info.audio_cov_start,
+                    info.audio_cov_end,
+                    info.solo_weight,
+                )
+            )
+        log.info("%s", "\n".join(lines))
+
+    # Every slot produces exactly one clip (camera or black filler), so both
+    # lists are preallocated and filled by slot position.
+    n_slots = len(slots)
+    seq: List[CutClip] = [None] * n_slots  # type: ignore[list-item]
+    plan_segments: Optional[List[Dict[str, Any]]] = (
+        [None] * n_slots if build_debug_plan else None  # type: ignore[list-item]
+    )
     last_take_index: Optional[int] = None
 
+    # Takes whose window can hold a full slot, keyed by slot duration. Slots
+    # share one duration except (usually) the last, so this is built ~twice.
+    # Each entry is sorted by audio coverage end, with the coverage ends kept
+    # alongside so a bisect skips takes whose coverage ended before the slot.
+    viable_by_duration: Dict[float, Tuple[List[TakeInfo], List[float]]] = {}
+    debug_enabled = log.isEnabledFor(logging.DEBUG)
+    black_slot_indices: List[int] = []
+
     # -----------------------------------------------------------------------
     # Slot-by-slot assignment
     # -----------------------------------------------------------------------
-    for slot in slots:
+    for slot_pos, slot in enumerate(slots):
+        slot_dur = slot.duration
         audio_t = audio_loop_start_t + slot.time_global
-        slot_end = audio_t + slot.duration
-
-        candidates: List[Tuple[float, float, str, Dict[str, Any]]] = []
-
-        for info in take_infos:
-            t: CameraTake = info["take"]
-            cov_start = info["audio_cov_start"]
-            cov_end = info["audio_cov_end"]
+        slot_end = audio_t + slot_dur
+
+        viable = viable_by_duration.get(slot_dur)
+        if viable is None:
+            viable_takes = sorted(
+                (
+                    info
+                    for info in take_infos
+                    if info.window_end_s - slot_dur >= info.window_start_s
+                ),
+                key=lambda info: info.audio_cov_end,
+            )
+            viable = (viable_takes, [info.audio_cov_end for info in viable_takes])
+            viable_by_duration[slot_dur] = viable
+        viable_takes, cov_ends = viable
+
+        # Track the best candidate in a single pass (no per-slot sort). When
+        # alternating, the previous take is ranked with a repeat penalty.
+        repeat_take_index = last_take_index if bars_per_cut == 1 else None
+        best: Optional[Tuple[float, float, str, TakeInfo]] = None
+        best_rank = 0.0
+        debug_candidates: Optional[List[Tuple[float, float, str, TakeInfo]]] = (
+            [] if debug_enabled else None
+        )
 
+        # Only takes with audio_cov_end > audio_t can overlap this slot.
+        for pos in range(bisect_right(cov_ends, audio_t), len(viable_takes)):
+            info = viable_takes[pos]
             # Does this slot fall inside the audio coverage of this take?
-            if slot_end <= cov_start or audio_t >= cov_end:
+            if slot_end <= info.audio_cov_start:
                 continue  # no overlap
 
             # Map audio time into camera time using cue alignment
             # (cue-start to cue-start)
-            ideal_start = audio_t - audio_start_t + t.start_anchor.time_s
-            ideal_end = ideal_start + slot.duration
+            ideal_start = audio_t - audio_start_t + info.anchor_time_s
+            ideal_end = ideal_start + slot_dur
 
-            window_start = t.window_start_s
-            window_end = t.window_end_s
+            window_start = info.window_start_s
+            window_end = info.window_end_s
 
             if ideal_start >= window_start and ideal_end <= window_end:
                 # Perfectly inside the take window
@@ -169,9 +260,16 @@ def _build_sync_sequence(
             else:
                 # Try to clamp to the take window, but do NOT treat this as
                 # unlimited reuse - if we cannot fit the full slot, skip.
-                clamped_start = max(window_start, min(ideal_start, window_end - slot.duration))
-                clamped_end = clamped_start + slot.duration
-                if clamped_start < window_start or clamped_end > window_end:
+                upper = window_end - slot_dur
+                # Inline clamp of ideal_start into [window_start, upper]
+                # (avoids two min/max calls per take).
+                if ideal_start < window_start:
+                    clamped_start = window_start
+                elif ideal_start > upper:
+                    clamped_start = upper
+                else:
+                    clamped_start = ideal_start
+                if clamped_start + slot_dur > window_end:
                     continue
 
                 inpoint = clamped_start
@@ -181,113 +279,105 @@ def _build_sync_sequence(
             # Scoring:
             #  - solo_weight: shorter windows get higher score (solos)
             #  - small bias for "ideal" vs "clamped"
-            solo_weight = info["solo_weight"]
-            score = solo_weight - boundary_penalty
-
-            candidates.append((score, inpoint, mapping_kind, info))
-
-        if not candidates:
-            log.warning(
-                "No camera covers slot %d at audio_t=%.3fs (dur=%.3fs) - using BLACK filler.",
-                slot.index,
-                audio_t,
-                slot.duration,
-            )
+            score = info.solo_weight - boundary_penalty
+
+            rank = score
+            if info.take_index == repeat_take_index:
+                rank -= _REPEAT_TAKE_PENALTY
+
+            # Only allocate a candidate tuple when it actually wins (or DEBUG wants it).
+            if (
+                best is None
+                or rank > best_rank
+                or (rank == best_rank and info.order < best[3].order)
+            ):
+                best = (score, inpoint, mapping_kind, info)
+                best_rank = rank
+                if debug_candidates is not None:
+                    debug_candidates.append(best)
+            elif debug_candidates is not None:
+                debug_candidates.append((score, inpoint, mapping_kind, info))
+
+        if best is None:
+            black_slot_indices.append(slot.index)
+            if debug_enabled:
+                log.debug(
+                    "No camera covers slot %d at audio_t=%.3fs (dur=%.3fs) - using BLACK filler.",
+                    slot.index,
+                    audio_t,
+                    slot_dur,
+                )
 
             # Black filler clip for this bar
-            black_ref = SimpleVideoRef(
-                filename="__BLACK__",  # dummy path; renderer will special-case
-                kind="black",
-            )
-
-            seq.append(
-                CutClip(
-                    time_global=slot.time_global,
-                    duration=slot.duration,
-                    video=black_ref,
-                    inpoint=0.0,
-                    outpoint=slot.duration,
-                )
+            seq[slot_pos] = CutClip(
+                time_global=slot.time_global,
+                duration=slot_dur,
+                video=_BLACK_REF,
+                inpoint=0.0,
+                outpoint=slot_dur,
             )
 
-            plan_segments.append(
-                {
+            if plan_segments is not None:
+                plan_segments[slot_pos] = {
                     "slot_index": slot.index,
                     "time_global": audio_t,
-                    "duration": slot.duration,
-                    "bar_index": rec.loop_start_bar + slot.bar_index,
+                    "duration": slot_dur,
+                    "bar_index": loop_start_bar + slot.bar_index,
                     "camera_file": None,
                     "camera_take_index": None,
                     "camera_inpoint": None,
                     "camera_mapping_kind": "black",
                     "score": None,
                     "audio_time": audio_t,
-                    "audio_start_anchor": {
-                        "time_s": audio.start_anchor.time_s,
-                        "ref_id": audio.start_anchor.ref_id,
-                    },
-                    "camera_start_anchor": None,
-                    "camera_window_start_s": None,
-                    "camera_window_end_s": None,
-                    "audio_coverage_start_s": None,
-                    "audio_coverage_end_s": None,
                 }
-            )
             last_take_index = None
             continue
 
 
-        # Pick best candidate for this slot (optionally alternate takes when bars_per_cut == 1).
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        chosen_score, inpoint, mapping_kind, info = candidates[0]
-        if bars_per_cut == 1 and len(candidates) > 1 and last_take_index is not None:
-            for cand in candidates:
-                cand_take_idx = cand[3]["take"].index
-                if cand_take_idx != last_take_index:
-                    chosen_score, inpoint, mapping_kind, info = cand
-                    break
-        best_score = chosen_score
-        t: CameraTake = info["take"]
-        last_take_index = t.index
-
-        seq.append(
-            CutClip(
-                time_global=slot.time_global,
-                duration=slot.duration,
-                video=SimpleVideoRef(filename=str(t.file)),
-                inpoint=inpoint,
-                outpoint=inpoint + slot.duration,
+        if debug_candidates is not None:
+            log.debug(
+                "Slot %d candidates: %s",
+                slot.index,
+                [(c[3].take_index, round(c[0], 3), c[2]) for c in debug_candidates],
             )
+
+        best_score, inpoint, mapping_kind, info = best
+        last_take_index = info.take_index
+
+        seq[slot_pos] = CutClip(
+            time_global=slot.time_global,
+            duration=slot_dur,
+            video=info.video_ref,
+            inpoint=inpoint,
+            outpoint=inpoint + slot_dur,
         )
 
-        plan_segments.append(
-            {
+        if plan_segments is not None:
+            plan_segments[slot_pos] = {
                 "slot_index": slot.index,
                 "time_global": audio_t,  # real audio time
-                "duration": slot.duration,
-                "bar_index": rec.loop_start_bar + slot.bar_index,
-                "camera_file": str(t.file),
-                "camera_take_index": t.index,
+                "duration": slot_dur,
+                "bar_index": loop_start_bar + slot.bar_index,
+                "camera_file": info.file_str,
+                "camera_take_index": info.take_index,
                 "camera_inpoint": inpoint,
                 "camera_mapping_kind": mapping_kind,
                 "score": best_score,
                 "audio_time": audio_t,
-                "audio_start_anchor": {
-                    "time_s": audio.start_anchor.time_s,
-                    "ref_id": audio.start_anchor.ref_id,
-                },
-                "camera_start_anchor": {
-                    "time_s": t.start_anchor.time_s,
-                    "ref_id": t.start_anchor.ref_id,
-                },
-                "camera_window_start_s": t.window_start_s,
-                "camera_window_end_s": t.window_end_s,
-                "audio_coverage_start_s": info["audio_cov_start"],
-                "audio_coverage_end_s": info["audio_cov_end"],
             }
+
+    if black_slot_indices:
+        log.warning(
+            "No camera covers %d of %d slots - using BLACK filler for slots %s",
+            len(black_slot_indices),
+            n_slots,
+            black_slot_indices,
         )
 
-    log.info("Built sync sequence: %d clips (from %d grid slots)", len(seq), len(slots))
+    log.info("Built sync sequence: %d clips (from %d grid slots)", len(seq), n_slots)
+
+    if plan_segments is None:
+        return seq, None
 
     debug_plan: Dict[str, Any] = {
         "kind": "sync_sequence_plan",
@@ -295,11 +385,11 @@ def _build_sync_sequence(
         "audio_file": str(audio.file),
         "audio_duration_s": audio_duration,
         "audio_start_anchor": {
-            "time_s": audio.start_anchor.time_s,
-            "ref_id": audio.start_anchor.ref_id,
+            "time_s": audio_start_t,
+            "ref_id": audio_start_ref,
         },
         "audio_loop_start_s": audio_loop_start_t,
-        "loop_start_bar": rec.loop_start_bar,
+        "loop_start_bar": loop_start_bar,
         "start_bar": rec.start_bar,
 
         "audio_end_hit": (
@@ -312,30 +402,32 @@ def _build_sync_sequence(
         ),
         "bars_per_cut": bars_per_cut,
         "cut_length_override_s": cut_length_override_s,
-        "slots_total": len(slots),
+        "slots_total": n_slots,
         "clips_built": len(seq),
+        # Per-take metadata lives here once; segments refer to it by
+        # camera_take_index instead of repeating windows/anchors per slot.
         "cameras": [
             {
-                "file": str(info["take"].file),
-                "take_index": info["take"].index,
-                "window_start_s": info["take"].window_start_s,
-                "window_end_s": info["take"].window_end_s,
+                "file": info.file_str,
+                "take_index": info.take_index,
+                "window_start_s": info.window_start_s,
+                "window_end_s": info.window_end_s,
                 "start_anchor": {
-                    "time_s": info["take"].start_anchor.time_s,
-                    "ref_id": info["take"].start_anchor.ref_id,
+                    "time_s": info.anchor_time_s,
+                    "ref_id": info.take.start_anchor.ref_id,
                 },
                 "end_anchor": {
-                    "time_s": info["take"].end_anchor.time_s,
-                    "ref_id": info["take"].end_anchor.ref_id,
+                    "time_s": info.take.end_anchor.time_s,
+                    "ref_id": info.take.end_anchor.ref_id,
                 }
-                if info["take"].end_anchor
+                if info.take.end_anchor
                 else None,
-                "duration_s": info["duration_s"],
+                "duration_s": info.duration_s,
                 "audio_coverage": {
-                    "start_s": info["audio_cov_start"],
-                    "end_s": info["audio_cov_end"],
+                    "start_s": info.audio_cov_start,
+                    "end_s": info.audio_cov_end,
                 },
-                "solo_weight": info["solo_weight"],
+                "solo_weight": info.solo_weight,
             }
             for info in take_infos
         ],
@@ -11,7 +11,7 @@ from typing import Optional
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncRecording:
     project_name: str
     bpm: float
@@ -23,13 +23,13 @@ class SyncRecording:
     loop_end_bar: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CueAnchor:
     time_s: float
     ref_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraTake:
     file: Path
     window_start_s: float
@@ -39,7 +39,7 @@ class CameraTake:
     index: int  # 1-based index in JSON (primary_cue_matches)
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioCueInfo:
     file: Path
     duration_s: float
@@ -47,7 +47,7 @@ class AudioCueInfo:
     end_hit: Optional[CueAnchor]
 
 
-@dataclass
+@dataclass(slots=True)
 class ChosenCamera:
     """
     High-level choice: which camera file to use (we may still have multiple
@@ -57,7 +57,7 @@ class ChosenCamera:
     duration_s: float  # duration of the chosen reference window/file span
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GridSlot:
     """
     One bar-based cut slot on the *audio* timeline.
@@ -68,9 +68,12 @@ class GridSlot:
     bar_index: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimpleVideoRef:
     """
     Minimal adapter so CutClip can reference a 'video' with just a filename.
+    Frozen so one instance can be shared by every clip of a take.
     """
     filename: str
+    camera_id: Optional[str] = None
+    kind: str = "camera"  # "camera" or "black"
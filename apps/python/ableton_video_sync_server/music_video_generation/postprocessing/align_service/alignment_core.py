@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Union
+
+import numpy as np
 
 
 @dataclass
@@ -62,3 +64,51 @@ def compute_segment_alignment(
         used_duration=used_duration,
         pad_end=pad_end,
     )
+
+
+def _clamp0(x: np.ndarray) -> np.ndarray:
+    # fmax mirrors max(0.0, x) for NaN; "+ 0.0" turns -0.0 into 0.0 like max() does
+    return np.fmax(x, 0.0) + 0.0
+
+
+def compute_segment_alignment_batch(
+    *,
+    seg_starts: np.ndarray,
+    seg_ends: np.ndarray,
+    audio_cue: Union[float, np.ndarray],
+    audio_duration: float,
+    video_durations: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized compute_segment_alignment for many segments at once.
+
+    seg_ends uses NaN for "no end" (segment runs to the end of the video).
+    Returns arrays keyed like the SegmentAlignment fields: relative_offset,
+    trim_start, pad_start, used_duration, pad_end.
+    """
+    seg_starts = np.asarray(seg_starts, dtype=np.float64)
+    seg_ends = np.asarray(seg_ends, dtype=np.float64)
+    video_durations = np.asarray(video_durations, dtype=np.float64)
+
+    relative_offset = seg_starts - np.asarray(audio_cue, dtype=np.float64)
+
+    trim_start = _clamp0(relative_offset)
+    pad_start = _clamp0(-relative_offset)
+
+    seg_duration = _clamp0(
+        np.where(np.isnan(seg_ends), video_durations - seg_starts, seg_ends - seg_starts)
+    )
+    available = np.minimum(seg_duration, _clamp0(video_durations - trim_start))
+
+    usable_audio = _clamp0(audio_duration - pad_start)
+    used_duration = np.minimum(usable_audio, available)
+
+    pad_end = _clamp0(audio_duration - pad_start - used_duration)
+
+    return {
+        "relative_offset": relative_offset,
+        "trim_start": trim_start,
+        "pad_start": pad_start,
+        "used_duration": used_duration,
+        "pad_end": pad_end,
+    }
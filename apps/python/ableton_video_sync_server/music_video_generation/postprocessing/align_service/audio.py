@@ -1,14 +1,34 @@
 from __future__ import annotations
 
+import json
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List
 
 from loguru import logger
 
+from .io import _dump_json_pretty, _load_json
+
 AUDIO_EXTS = (".wav", ".mp3", ".m4a", ".aac", ".flac", ".aiff")
 
 
+def list_audio_files(directory: Path, exts: Iterable[str] = AUDIO_EXTS) -> List[Path]:
+    """
+    Sorted audio files directly inside ``directory`` (single scandir pass;
+    file type comes from the directory entry, extension from the name).
+    """
+    ext_tuple = tuple(e.lower() for e in exts)
+    with os.scandir(directory) as it:
+        return sorted(
+            Path(e.path)
+            for e in it
+            if e.name.lower().endswith(ext_tuple) and e.is_file()
+        )
+
+
 def resolve_audio(root: Path, override: Optional[str]) -> Path:
     """
     Pick the master audio:
@@ -25,15 +45,11 @@ def resolve_audio(root: Path, override: Optional[str]) -> Path:
     music_dir = root / "footage" / "music"
     candidates: List[Path] = []
 
-    if music_dir.exists():
-        candidates.extend(
-            sorted(p for p in music_dir.iterdir() if p.suffix.lower() in AUDIO_EXTS)
-        )
+    if music_dir.is_dir():
+        candidates.extend(list_audio_files(music_dir))
 
     if not candidates:
-        candidates.extend(
-            sorted(p for p in root.glob("*") if p.is_file() and p.suffix.lower() in AUDIO_EXTS)
-        )
+        candidates.extend(list_audio_files(root))
 
     if not candidates:
         raise ValueError("No audio files found in project. Provide audio_path explicitly.")
@@ -41,7 +57,98 @@ def resolve_audio(root: Path, override: Optional[str]) -> Path:
     return candidates[0]
 
 
-def probe_duration(path: Path) -> float:
+class ProbeCache:
+    """
+    ffprobe durations persisted in a sidecar JSON, keyed by
+    ``path:mtime_ns:size`` so re-runs skip probing unchanged files.
+
+    Only entries looked up or stored during this run are written back,
+    which drops keys for files that changed or disappeared.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stored: Dict[str, float] = {}
+        self._used: Dict[str, float] = {}
+        if path.exists():
+            try:
+                raw = _load_json(path)
+            except (OSError, JSONDecodeError):
+                logger.warning("align_service: ignoring unreadable probe cache %s", path)
+            else:
+                if isinstance(raw, dict):
+                    self._stored = {
+                        k: float(v) for k, v in raw.items() if isinstance(v, (int, float))
+                    }
+
+    @staticmethod
+    def _key(media: Path) -> str:
+        st = media.stat()
+        return f"{media}:{st.st_mtime_ns}:{st.st_size}"
+
+    def get(self, media: Path) -> Optional[float]:
+        key = self._key(media)
+        dur = self._stored.get(key)
+        if dur is not None:
+            self._used[key] = dur
+        return dur
+
+    def put(self, media: Path, duration: float) -> None:
+        self._used[self._key(media)] = duration
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(_dump_json_pretty(self._used))
+        tmp.replace(self.path)
+
+
+def probe_duration(path: Path, cache: Optional[ProbeCache] = None) -> float:
+    """
+    Return media duration in seconds, from ``cache`` when it has an entry
+    for the unchanged file, otherwise via ffprobe.
+    """
+    if cache is not None:
+        cached = cache.get(path)
+        if cached is not None:
+            return cached
+
+    dur = _run_ffprobe(path)
+    if cache is not None:
+        cache.put(path, dur)
+    return dur
+
+
+def probe_durations(
+    paths: Iterable[Path],
+    cache: Optional[ProbeCache] = None,
+) -> Dict[Path, float]:
+    """
+    Probe several files at once. Cache misses run ffprobe concurrently
+    (the work is process-spawn bound, so threads are enough).
+    """
+    durations: Dict[Path, float] = {}
+    misses: Dict[Path, None] = {}  # ordered set: a path listed twice is probed once
+    for p in paths:
+        if p in durations or p in misses:
+            continue
+        cached = cache.get(p) if cache is not None else None
+        if cached is not None:
+            durations[p] = cached
+        else:
+            misses[p] = None
+
+    if misses:
+        workers = min(len(misses), os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for p, dur in zip(misses, pool.map(_run_ffprobe, misses)):
+                durations[p] = dur
+                if cache is not None:
+                    cache.put(p, dur)
+    return durations
+
+
+def _run_ffprobe(path: Path) -> float:
     """
     Return media duration in seconds using ffprobe.
     """
@@ -52,16 +159,16 @@ def probe_duration(path: Path) -> float:
             "error",
             "-show_entries",
             "format=duration",
-            "-of",
-            "default=noprint_wrappers=1:nokey=1",
+            "-print_format",
+            "json",
             str(path),
         ]
-        out = subprocess.check_output(cmd, text=True).strip()
-        dur = float(out)
+        out = subprocess.check_output(cmd, text=True)
+        dur = float(json.loads(out)["format"]["duration"])
         if dur <= 0:
             raise RuntimeError(f"Non-positive duration for {path}")
         return dur
     except subprocess.CalledProcessError as exc:
         raise RuntimeError(f"ffprobe failed for {path}: {exc}") from exc
-    except ValueError as exc:
+    except (ValueError, KeyError, TypeError) as exc:
         raise RuntimeError(f"Unable to parse duration for {path}: {exc}") from exc
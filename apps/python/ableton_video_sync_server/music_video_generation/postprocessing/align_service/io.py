@@ -1,21 +1,87 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from json import JSONDecodeError
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional: stream the legacy recordings DB instead of parsing it whole
+    ijson = None
+
+
+# ---------------------------------------------------------------------------
+# JSON helpers (orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+# callers only need to catch JSONDecodeError)
+# ---------------------------------------------------------------------------
+
+def _load_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=8)
+def _load_json_at(path_str: str, mtime_ns: int, size: int) -> Any:
+    return _load_json(Path(path_str))
+
+
+def _load_json_cached(path: Path) -> Any:
+    """
+    Parse ``path``, reusing the previous result while its mtime/size are
+    unchanged (the UI polls these files). The returned object is shared
+    between calls, so callers must not mutate it.
+    """
+    st = path.stat()
+    return _load_json_at(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _dump_json_pretty(payload: Any) -> bytes:
+    # default=str lets Path (and other stray) values through on both paths
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
 
 # ---------------------------------------------------------------------------
 # State file (alignment_results.json)
 # ---------------------------------------------------------------------------
 
+# Runs with more debug rows than this write them to debug.jsonl next to the
+# state file instead of pretty-printing them into alignment_results.json.
+DEBUG_INLINE_MAX = 100
+
+
 def _state_path(root: Path) -> Path:
     return root / "generated" / "aligned" / "alignment_results.json"
 
 
+def _debug_path(root: Path) -> Path:
+    return root / "generated" / "aligned" / "debug.jsonl"
+
+
+def _dump_jsonl(rows: List[Any]) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        return b"".join(orjson.dumps(row, default=str, option=option) for row in rows)
+    return "".join(
+        json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows
+    ).encode("utf-8")
+
+
 def read_state(root: Path) -> Dict:
     path = _state_path(root)
     if not path.exists():
@@ -29,7 +95,8 @@ def read_state(root: Path) -> Dict:
             "debug": [],
         }
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        # shallow copy: the setdefault calls below must not touch the cached dict
+        data = dict(_load_json_cached(path))
     except JSONDecodeError:
         logger.warning("align_service: failed to parse %s, resetting state.", path)
         return {
@@ -50,13 +117,53 @@ def read_state(root: Path) -> Dict:
 
 
 def write_state(root: Path, payload: Dict) -> None:
+    """
+    Write alignment_results.json. Large debug lists go to debug.jsonl and the
+    state file gets "debug": [] plus a "debug_file" reference instead.
+    """
     path = _state_path(root)
     path.parent.mkdir(parents=True, exist_ok=True)
+
+    debug_path = _debug_path(root)
+    debug = payload.get("debug")
+    if isinstance(debug, list) and len(debug) > DEBUG_INLINE_MAX:
+        debug_tmp = debug_path.with_suffix(".tmp")
+        debug_tmp.write_bytes(_dump_jsonl(debug))
+        debug_tmp.replace(debug_path)
+        payload = {
+            **payload,
+            "debug": [],
+            "debug_file": {"path": debug_path.name, "count": len(debug)},
+        }
+    else:
+        debug_path.unlink(missing_ok=True)
+
     tmp = path.with_suffix(".tmp")
-    tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.write_bytes(_dump_json_pretty(payload))
     tmp.replace(path)
 
 
+def read_debug(root: Path) -> List[Dict]:
+    """
+    Debug rows of the last alignment, whether inlined in the state file or
+    written to debug.jsonl.
+    """
+    state = read_state(root)
+    if not state.get("debug_file"):
+        return list(state.get("debug") or [])
+
+    debug_path = _debug_path(root)
+    if not debug_path.exists():
+        return []
+    loads = orjson.loads if orjson is not None else json.loads
+    rows: List[Dict] = []
+    with debug_path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                rows.append(loads(line))
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # Postprocess results (postprocess_matches.json)
 # ---------------------------------------------------------------------------
@@ -64,12 +171,15 @@ def write_state(root: Path, payload: Dict) -> None:
 def load_postprocess(root: Path) -> Dict:
     """
     Load postprocess_matches.json (cue positions for audio+video).
+
+    Returns a shallow copy of the cached parse; the nested media entries
+    are shared with the cache and must be treated as read-only.
     """
     path = root / "postprocess_matches.json"
     if not path.exists():
         raise RuntimeError("postprocess_matches.json not found. Run postprocess first.")
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return dict(_load_json_cached(path))
     except JSONDecodeError as exc:
         raise RuntimeError(f"Failed to parse {path}: {exc}") from exc
 
@@ -78,6 +188,33 @@ def load_postprocess(root: Path) -> Dict:
 # Ableton recordings metadata (recordings.json / ableton_recordings_db.json)
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=4)
+def _load_legacy_recordings_at(path_str: str, mtime_ns: int, size: int) -> Tuple[Dict, ...]:
+    """
+    Flattened recordings of a legacy ableton_recordings_db.json.
+
+    Only the recordings are kept (and cached); with ijson installed the
+    sessions payload is streamed rather than materialized.
+    """
+    path = Path(path_str)
+    if ijson is not None:
+        with path.open("rb") as f:
+            try:
+                return tuple(ijson.items(f, "sessions.item.recordings.item", use_float=True))
+            except ijson.JSONError as exc:
+                raise JSONDecodeError(str(exc), "", 0) from exc
+
+    raw = _load_json(path)
+    recs: List[Dict] = []
+    sessions = raw.get("sessions")
+    if isinstance(sessions, list):
+        for session in sessions:
+            items = session.get("recordings")
+            if isinstance(items, list):
+                recs.extend(items)
+    return tuple(recs)
+
+
 def load_recordings(root: Path) -> List[Dict]:
     """
     Load Ableton recordings metadata.
@@ -115,7 +252,7 @@ def load_recordings(root: Path) -> List[Dict]:
     # Preferred: recordings.json
     if primary.exists():
         try:
-            raw = json.loads(primary.read_text(encoding="utf-8"))
+            raw = _load_json_cached(primary)
         except JSONDecodeError:
             logger.warning("align_service: failed to parse %s", primary)
         else:
@@ -133,19 +270,13 @@ def load_recordings(root: Path) -> List[Dict]:
     # Fallback: legacy ableton_recordings_db.json
     if legacy_db.exists():
         try:
-            raw = json.loads(legacy_db.read_text(encoding="utf-8"))
+            st = legacy_db.stat()
+            recs = _load_legacy_recordings_at(str(legacy_db), st.st_mtime_ns, st.st_size)
         except JSONDecodeError:
             logger.warning("align_service: failed to parse %s", legacy_db)
         else:
-            recs: List[Dict] = []
-            sessions = raw.get("sessions")
-            if isinstance(sessions, list):
-                for session in sessions:
-                    items = session.get("recordings")
-                    if isinstance(items, list):
-                        recs.extend(items)
             if recs:
-                return recs
+                return list(recs)
 
     logger.warning(
         "align_service: no usable recordings metadata found "
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
 
 from loguru import logger
 
@@ -12,7 +13,36 @@ _TIME_TOL = 0.5  # seconds tolerance between segment start and cue hit
 def _basename(path_str: str | None) -> Optional[str]:
     if not isinstance(path_str, str) or not path_str:
         return None
-    return Path(path_str).name.lower()
+    return os.path.basename(path_str).lower()
+
+
+@dataclass(frozen=True, slots=True)
+class RecordingIndex:
+    """
+    Recordings keyed by lowercased start/end cue basename (first recording wins).
+    """
+
+    by_start: Dict[str, Dict]
+    by_end: Dict[str, Dict]
+
+
+def build_recording_index(recordings: Sequence[Dict]) -> RecordingIndex:
+    """
+    Index recordings once so each segment lookup is a dict hit instead of a
+    scan over all recordings.
+    """
+    by_start: Dict[str, Dict] = {}
+    by_end: Dict[str, Dict] = {}
+    basename = _basename
+    for rec in recordings:
+        get = rec.get
+        r_start = basename(get("start_sound_path")) or basename(get("start_combined_path"))
+        if r_start and r_start not in by_start:
+            by_start[r_start] = rec
+        r_end = basename(get("end_sound_path")) or basename(get("end_combined_path"))
+        if r_end and r_end not in by_end:
+            by_end[r_end] = rec
+    return RecordingIndex(by_start=by_start, by_end=by_end)
 
 
 def _find_nearest_hit(
@@ -40,6 +70,7 @@ def find_recording_for_segment(
     start_hits: Sequence[Dict],
     end_hits: Sequence[Dict],
     recordings: Sequence[Dict],
+    recording_index: Optional[RecordingIndex] = None,
 ) -> Optional[Dict]:
     """
     Heuristic mapping:
@@ -47,39 +78,35 @@ def find_recording_for_segment(
     - Find the nearest start_hit to seg_start within _TIME_TOL.
     - Use its ref_id to match a recording's start_sound_path (or start_combined_path).
     - If that fails and we have seg_end, do the same with end_hits vs end_sound_path.
+
+    Pass a recording_index (build_recording_index(recordings)) when calling
+    this for many segments against the same recordings.
     """
 
     if not recordings:
         return None
 
+    if recording_index is None:
+        recording_index = build_recording_index(recordings)
+
     # 1) nearest start hit around segment start
     start_anchor = _find_nearest_hit(seg_start, start_hits, _TIME_TOL)
-    candidates: List[Dict] = []
+    match: Optional[Dict] = None
 
     if start_anchor:
         ref_id = str(start_anchor.get("ref_id") or "").lower()
         if ref_id:
-            for rec in recordings:
-                r_start = _basename(rec.get("start_sound_path")) or _basename(
-                    rec.get("start_combined_path")
-                )
-                if r_start and r_start.lower() == ref_id:
-                    candidates.append(rec)
+            match = recording_index.by_start.get(ref_id)
 
     # 2) fallback: use end anchor near seg_end if needed
-    if not candidates and seg_end is not None:
+    if match is None and seg_end is not None:
         end_anchor = _find_nearest_hit(seg_end, end_hits, _TIME_TOL)
         if end_anchor:
             ref_id = str(end_anchor.get("ref_id") or "").lower()
             if ref_id:
-                for rec in recordings:
-                    r_end = _basename(rec.get("end_sound_path")) or _basename(
-                        rec.get("end_combined_path")
-                    )
-                    if r_end and r_end.lower() == ref_id:
-                        candidates.append(rec)
-
-    if not candidates:
+                match = recording_index.by_end.get(ref_id)
+
+    if match is None:
         logger.debug(
             "align_service: no recording matched for segment at %.3fs (start ref=%s, end ref=%s)",
             seg_start,
@@ -89,4 +116,4 @@ def find_recording_for_segment(
         return None
 
     # For now, just pick the first candidate; if needed we can add scoring later.
-    return candidates[0]
+    return match
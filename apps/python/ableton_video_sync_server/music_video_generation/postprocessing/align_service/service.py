@@ -1,38 +1,75 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
+import numpy as np
 from loguru import logger
 
-from .audio import resolve_audio, probe_duration
-from .io import load_postprocess, load_recordings, read_state, write_state
+from .audio import ProbeCache, list_audio_files, resolve_audio, probe_durations
+from .io import load_postprocess, load_recordings, read_debug, read_state, write_state
 from .utils import find_start_cue
-from .video import run_ffmpeg
-from .match import find_recording_for_segment
-from .alignment_core import compute_segment_alignment, SegmentAlignment  # <- shared math
+from .video import (
+    BATCH_MAX_OUTPUTS,
+    HW_MAX_ENCODE_SESSIONS,
+    SOFTWARE_ENCODER,
+    plan_batches,
+    run_ffmpeg_batch,
+    select_encoder,
+)
+from .match import build_recording_index, find_recording_for_segment
+from .alignment_core import compute_segment_alignment_batch  # <- shared math
 
 VIDEO_EXTS = (".mp4", ".mkv", ".mov", ".ts", ".mts", ".m4v", ".avi", ".webm")
 AUDIO_EXTS = (".wav", ".mp3", ".m4a", ".aac")
 
+# Minimum threads given to each x264 encode when several run in parallel.
+FFMPEG_THREADS_PER_ENCODE = 2
+
 
 class FootageAlignService:
+    def __init__(self) -> None:
+        # Path.resolve() results, kept for the duration of one align() call
+        self._resolve_cache: Dict[str, Path] = {}
+
     # ---------------------------------------------------------
     # Public API
     # ---------------------------------------------------------
-    def align(self, project_path: str, *, audio_path: Optional[str] = None) -> Dict:
+    def align(
+        self,
+        project_path: str,
+        *,
+        audio_path: Optional[str] = None,
+        parallel: Optional[int] = None,
+        debug: bool = False,
+    ) -> Dict:
+        """
+        Align every video segment to the master audio and write the state file.
+
+        parallel is the number of concurrent ffmpeg encodes; by default
+        it is derived from the CPU count (each encode gets at least
+        FFMPEG_THREADS_PER_ENCODE threads). Pass 1 to encode serially.
+        The per-segment "debug" rows are only built (and written) when
+        debug is set.
+        """
+        self._resolve_cache.clear()
         root = self._resolve_project(project_path)
 
+        output_dir = root / "generated" / "aligned"
+        probe_cache = ProbeCache(output_dir / ".probe_cache.json")
+
         # 1) pick / resolve master audio
         audio = resolve_audio(root, audio_path)
-        audio_dur = probe_duration(audio)
 
         # 2) load postprocess (cues for audio + video) and recordings
         post = load_postprocess(root)
         media_entries = post.get("media") or []
 
         recordings = load_recordings(root)
+        recording_index = build_recording_index(recordings)
 
         # 3) find audio cue in the chosen master audio file
         audio_entry = self._find_postprocess_entry_for_path(media_entries, audio)
@@ -45,22 +82,24 @@ class FootageAlignService:
 
         logger.info("Aligning: audio cue at %.3fs", audio_cue)
 
-        output_dir = root / "generated" / "aligned"
         results: List[Dict] = []
-        debug: List[Dict] = []
+        debug_rows: List[Dict] = []
+        ffmpeg_jobs: List[Dict] = []
 
         # -----------------------------------------------------
-        # per-video / per-segment alignment
+        # collect alignable videos, then probe their durations in one batch
         # -----------------------------------------------------
+        video_entries: List[Tuple[Dict, Path, List[Dict]]] = []
         for entry in media_entries:
             f = entry.get("file")
             if not f:
                 continue
 
-            video = Path(f)
-            if video.suffix.lower() not in VIDEO_EXTS:
+            # VIDEO_EXTS is lowercase; endswith(tuple) avoids re-parsing Path.suffix
+            if not f.lower().endswith(VIDEO_EXTS):
                 # skip audio entries etc.
                 continue
+            video = Path(f)
             if not video.exists():
                 logger.warning("Align: skipping missing video %s", video)
                 continue
@@ -70,7 +109,27 @@ class FootageAlignService:
                 logger.debug("Align: no segments for %s; skipping", video)
                 continue
 
-            video_dur = probe_duration(video)
+            video_entries.append((entry, video, segments))
+
+        # master audio goes into the same concurrent ffprobe batch as the videos
+        video_durations = probe_durations(
+            [audio, *(video for _, video, _ in video_entries)], probe_cache
+        )
+        audio_dur = video_durations[audio]
+
+        # -----------------------------------------------------
+        # per-video / per-segment alignment
+        # -----------------------------------------------------
+        log_debug = logger.debug
+
+        # (video, video_str, video_stem, video_dur, recording_meta, seg, seg_index, seg_start, seg_end)
+        pending: List[Tuple[Path, str, str, float, Dict[str, object], Dict, int, float, Optional[float]]] = []
+        add_pending = pending.append
+
+        for entry, video, segments in video_entries:
+            video_dur = video_durations[video]
+            video_str = str(video)
+            video_stem = video.stem
 
             # match Ableton recording for this clip (we can refine later, per segment)
             start_hits = entry.get("start_hits", [])
@@ -85,103 +144,139 @@ class FootageAlignService:
                 start_hits=start_hits,
                 end_hits=end_hits,
                 recordings=recordings,
+                recording_index=recording_index,
             )
 
+            # attach Ableton recording metadata (if we found a match)
+            if matched_recording:
+                recording_meta: Dict[str, object] = {
+                    "recording_id": matched_recording.get("id"),
+                    "track_names": matched_recording.get("recording_track_names", []) or [],
+                    "recording_start_sound": matched_recording.get("start_sound_path"),
+                    "recording_end_sound": matched_recording.get("end_sound_path"),
+                }
+            else:
+                recording_meta = {
+                    "recording_id": None,
+                    "track_names": [],
+                    "recording_start_sound": None,
+                    "recording_end_sound": None,
+                }
+
             for seg in segments:
                 seg_index = int(seg.get("index") or 0)
                 # must have a segment start
                 try:
                     seg_start = float(seg["start_time_s"])
                 except (KeyError, TypeError, ValueError):
-                    logger.debug("Align: skipping segment without start_time_s in %s", video)
+                    log_debug("Align: skipping segment without start_time_s in %s", video)
                     continue
 
                 seg_end_val = seg.get("end_time_s")
                 seg_end = float(seg_end_val) if isinstance(seg_end_val, (int, float)) else None
 
-                alignment: SegmentAlignment = compute_segment_alignment(
-                    seg_start=seg_start,
-                    seg_end=seg_end,
-                    audio_cue=audio_cue,
-                    audio_duration=audio_dur,
-                    video_duration=video_dur,
+                add_pending(
+                    (video, video_str, video_stem, video_dur, recording_meta, seg, seg_index, seg_start, seg_end)
                 )
 
-                # available / used durations are encoded in alignment
-                if alignment.used_duration < 0.25:
-                    logger.debug(
-                        "Align: skipping segment %d of %s (used_duration=%.3fs)",
-                        seg_index,
-                        video,
-                        alignment.used_duration,
-                    )
-                    continue
+        # alignment math for all segments in one vectorized pass
+        batch = compute_segment_alignment_batch(
+            seg_starts=np.fromiter((p[7] for p in pending), dtype=np.float64, count=len(pending)),
+            seg_ends=np.fromiter(
+                (np.nan if p[8] is None else p[8] for p in pending), dtype=np.float64, count=len(pending)
+            ),
+            audio_cue=audio_cue,
+            audio_duration=audio_dur,
+            video_durations=np.fromiter((p[3] for p in pending), dtype=np.float64, count=len(pending)),
+        )
+
+        add_result = results.append
+        add_debug = debug_rows.append
+        add_job = ffmpeg_jobs.append
+
+        for (
+            (video, video_str, video_stem, video_dur, recording_meta, seg, seg_index, seg_start, seg_end),
+            relative_offset,
+            trim_start,
+            pad_start,
+            used_duration,
+            pad_end,
+        ) in zip(
+            pending,
+            batch["relative_offset"].tolist(),
+            batch["trim_start"].tolist(),
+            batch["pad_start"].tolist(),
+            batch["used_duration"].tolist(),
+            batch["pad_end"].tolist(),
+        ):
+            # available / used durations are encoded in alignment
+            if used_duration < 0.25:
+                log_debug(
+                    "Align: skipping segment %d of %s (used_duration=%.3fs)",
+                    seg_index,
+                    video,
+                    used_duration,
+                )
+                continue
 
-                out_file = output_dir / f"{video.stem}_seg{seg_index:03d}_aligned.mp4"
-                run_ffmpeg(
+            out_file = output_dir / f"{video_stem}_seg{seg_index:03d}_aligned.mp4"
+            seg_duration = (
+                (seg_end - seg_start) if seg_end is not None else max(0.0, video_dur - seg_start)
+            )
+            add_job(
+                dict(
                     video=video,
                     audio=audio,
-                    trim_start=alignment.trim_start,
+                    trim_start=trim_start,
                     total_duration=audio_dur,
-                    pad_start=alignment.pad_start,
-                    pad_end=alignment.pad_end,
+                    pad_start=pad_start,
+                    pad_end=pad_end,
                     output=out_file,
                 )
+            )
 
-                meta: Dict[str, object] = {
-                    "source_video": str(video),
-                    "segment_index": seg_index,
-                    "segment_start_s": seg_start,
-                    "segment_end_s": seg_end,
-                    "segment_duration_s": (
-                        (seg_end - seg_start) if seg_end is not None else max(0.0, video_dur - seg_start)
-                    ),
-                    "trim_start": alignment.trim_start,
-                    "pad_start": alignment.pad_start,
-                    "pad_end": alignment.pad_end,
-                    "used_duration": alignment.used_duration,
-                    "output_path": str(out_file),
-                    "flags": {
-                        "missing_end": bool(seg.get("edge_case") == "missing_end"),
-                        "too_short": alignment.used_duration < 1.0,
-                        "usable": alignment.used_duration >= 1.0,
-                        "confidence": 0.0,  # can be wired from cue scores later
-                    },
-                }
-
-                # attach Ableton recording metadata (if we found a match)
-                if matched_recording:
-                    meta["recording_id"] = matched_recording.get("id")
-                    meta["track_names"] = matched_recording.get("recording_track_names", []) or []
-                    meta["recording_start_sound"] = matched_recording.get("start_sound_path")
-                    meta["recording_end_sound"] = matched_recording.get("end_sound_path")
-                else:
-                    meta["recording_id"] = None
-                    meta["track_names"] = []
-                    meta["recording_start_sound"] = None
-                    meta["recording_end_sound"] = None
-
-                results.append(meta)
-
-                debug.append(
+            meta: Dict[str, object] = {
+                "source_video": video_str,
+                "segment_index": seg_index,
+                "segment_start_s": seg_start,
+                "segment_end_s": seg_end,
+                "segment_duration_s": seg_duration,
+                "trim_start": trim_start,
+                "pad_start": pad_start,
+                "pad_end": pad_end,
+                "used_duration": used_duration,
+                "output_path": str(out_file),
+                "flags": {
+                    "missing_end": bool(seg.get("edge_case") == "missing_end"),
+                    "too_short": used_duration < 1.0,
+                    "usable": used_duration >= 1.0,
+                    "confidence": 0.0,  # can be wired from cue scores later
+                },
+            }
+
+            meta.update(recording_meta)
+            add_result(meta)
+
+            if debug:
+                add_debug(
                     {
-                        "file": str(video),
+                        "file": video_str,
                         "segment_index": seg_index,
                         "video_cue": seg_start,
                         "audio_cue": audio_cue,
-                        "relative_offset": alignment.relative_offset,
-                        "trim_start": alignment.trim_start,
-                        "pad_start": alignment.pad_start,
-                        "pad_end": alignment.pad_end,
+                        "relative_offset": relative_offset,
+                        "trim_start": trim_start,
+                        "pad_start": pad_start,
+                        "pad_end": pad_end,
                         "video_duration": video_dur,
                         "segment_end_s": seg_end,
-                        "segment_duration_s": (
-                            (seg_end - seg_start) if seg_end is not None else max(0.0, video_dur - seg_start)
-                        ),
-                        "used_duration": alignment.used_duration,
+                        "segment_duration_s": seg_duration,
+                        "used_duration": used_duration,
                     }
                 )
 
+        self._run_ffmpeg_jobs(ffmpeg_jobs, parallel)
+
         payload: Dict[str, object] = {
             "project_path": str(root),
             "audio_path": str(audio),
@@ -189,35 +284,102 @@ class FootageAlignService:
             "output_dir": str(output_dir),
             "segments_aligned": len(results),
             "results": results,
-            "debug": debug,
             "generated_at": datetime.now(UTC).isoformat(),
         }
+        if debug:
+            payload["debug"] = debug_rows
         write_state(root, payload)
+        probe_cache.save()
+        self._resolve_cache.clear()
         return payload
 
-    def state(self, project_path: str) -> Dict:
+    def state(self, project_path: str, include_debug: bool = False) -> Dict:
         """
         Read-only access for the UI: returns the last alignment_results.json.
+
+        With include_debug, debug rows spilled to debug.jsonl are inlined
+        under "debug" again.
         """
         root = self._resolve_project(project_path)
-        return read_state(root)
+        state = read_state(root)
+        if include_debug and state.get("debug_file"):
+            state["debug"] = read_debug(root)
+        return state
 
     # ---------------------------------------------------------
     # Internals
     # ---------------------------------------------------------
+    def _resolve(self, path: Path) -> Path:
+        key = str(path)
+        resolved = self._resolve_cache.get(key)
+        if resolved is None:
+            resolved = self._resolve_cache[key] = path.resolve()
+        return resolved
+
     def _resolve_project(self, path: str) -> Path:
-        root = Path(path).expanduser().resolve()
+        root = self._resolve(Path(path).expanduser())
         if not root.exists():
             raise RuntimeError(f"Project not found: {path}")
         return root
 
+    def _run_ffmpeg_jobs(self, jobs: List[Dict], parallel: Optional[int]) -> None:
+        if parallel is None:
+            parallel = max(1, (os.cpu_count() or 1) // FFMPEG_THREADS_PER_ENCODE)
+        max_outputs = BATCH_MAX_OUTPUTS
+        if select_encoder() != SOFTWARE_ENCODER:
+            # each output is one hardware encoder session: keep
+            # workers x outputs within the driver's session limit
+            max_outputs = min(max_outputs, HW_MAX_ENCODE_SESSIONS)
+            parallel = min(parallel, max(1, HW_MAX_ENCODE_SESSIONS // max_outputs))
+        # segments of one video that lie close together share an ffmpeg
+        # process (input open and decode, see run_ffmpeg_batch); every batch
+        # is its own job, so one long take still encodes in parallel
+        groups: Dict[Tuple[Path, Path], List[Dict]] = {}
+        for job in jobs:
+            seg = dict(job)
+            groups.setdefault((seg.pop("video"), seg.pop("audio")), []).append(seg)
+        batches = [
+            (video, audio, batch)
+            for (video, audio), segments in groups.items()
+            for batch in plan_batches(segments, max_outputs=max_outputs)
+        ]
+
+        workers = max(1, min(parallel, len(batches)))
+        if workers == 1:
+            for video, audio, batch in batches:
+                run_ffmpeg_batch(video, audio, batch)
+            return
+
+        # split the cores between the concurrent encodes (K = cpu / N)
+        threads = max(FFMPEG_THREADS_PER_ENCODE, (os.cpu_count() or 1) // workers)
+        logger.info(
+            "Align: encoding %d segments of %d videos in %d batches with %d workers x %d threads",
+            len(jobs),
+            len(groups),
+            len(batches),
+            workers,
+            threads,
+        )
+        # each job is an ffmpeg subprocess, so threads parallelize as well as processes
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(run_ffmpeg_batch, video, audio, batch, threads=threads)
+                for video, audio, batch in batches
+            ]
+            for future in futures:
+                future.result()
+
     def _find_postprocess_entry_for_path(self, media_entries, audio: Path):
+        try:
+            audio_resolved = self._resolve(audio)
+        except Exception:
+            return None
         for e in media_entries:
             f = e.get("file", "")
             if not f:
                 continue
             try:
-                if Path(f).resolve() == audio.resolve():
+                if self._resolve(Path(f)) == audio_resolved:
                     return e
             except Exception:
                 # be robust to weird paths
@@ -248,9 +410,7 @@ class FootageAlignService:
         def collect_from_dir(d: Path) -> None:
             if not d.is_dir():
                 return
-            for p in sorted(d.iterdir()):
-                if p.is_file() and p.suffix.lower() in AUDIO_EXTS:
-                    candidates.append(p)
+            candidates.extend(list_audio_files(d, AUDIO_EXTS))
 
         collect_from_dir(audio_dir)
         collect_from_dir(music_dir)
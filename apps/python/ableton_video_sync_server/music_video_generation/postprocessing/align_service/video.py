@@ -1,11 +1,118 @@
 from __future__ import annotations
 
+import math
 import subprocess
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Sequence
 
 from loguru import logger
 
+SOFTWARE_ENCODER = "libx264"
+
+# Hardware H.264 encoders in order of preference; libx264 is the fallback.
+HW_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv")
+
+_ENCODER_ARGS: Dict[str, List[str]] = {
+    "h264_nvenc": ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "20", "-b:v", "0"],
+    "h264_videotoolbox": ["-c:v", "h264_videotoolbox", "-q:v", "55"],
+    "h264_qsv": ["-c:v", "h264_qsv", "-global_quality", "20"],
+    SOFTWARE_ENCODER: ["-c:v", "libx264", "-preset", "veryfast", "-crf", "20"],
+}
+
+# Max outputs encoded by one ffmpeg process in run_ffmpeg_batch; bounds the
+# frames buffered between the split outputs. Every output is its own encoder
+# session, so with a hardware encoder batches x outputs running at once must
+# also stay within HW_MAX_ENCODE_SESSIONS.
+BATCH_MAX_OUTPUTS = 4
+
+# Max concurrent hardware encoder sessions (summed over all ffmpeg processes).
+# Consumer NVENC drivers allow as few as 3; going over fails the encode.
+HW_MAX_ENCODE_SESSIONS = 3
+
+# Max gap (seconds of source) between one segment's end and the next one's
+# trim point for the two to share a batch. A batch decodes everything from its
+# earliest trim to its latest end, so far-apart segments get their own seek.
+BATCH_MAX_GAP_S = 5.0
+
+_AUDIO_OUT_ARGS = ["-c:a", "aac", "-b:a", "192k", "-shortest", "-avoid_negative_ts", "make_zero"]
+
+# Set once a hardware encode fails where the libx264 retry of the same job
+# succeeds (e.g. nvenc compiled in but no GPU present), so later segments go
+# straight to libx264. Encodes run on a thread pool, hence the lock.
+_hw_encoder_failed = False
+_HW_ENCODER_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def detect_encoder() -> str:
+    """
+    Pick the best H.264 encoder this ffmpeg build offers (probed once).
+    """
+    try:
+        out = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return SOFTWARE_ENCODER
+
+    available = {line.split()[1] for line in out.splitlines() if len(line.split()) > 1}
+    for name in HW_ENCODERS:
+        if name in available:
+            logger.info("align_service: using hardware encoder %s", name)
+            return name
+    return SOFTWARE_ENCODER
+
+
+def select_encoder() -> str:
+    """
+    Encoder the next encode will use: detect_encoder(), or libx264 once the
+    hardware encoder has been disabled.
+    """
+    with _HW_ENCODER_LOCK:
+        failed = _hw_encoder_failed
+    return SOFTWARE_ENCODER if failed else detect_encoder()
+
+
+def _encode(build_cmd: Callable[[str], List[str]], encoder: Optional[str]) -> None:
+    """
+    Run build_cmd(encoder) (default: select_encoder()). A failed hardware
+    encode is retried with libx264; the hardware encoder is only disabled for
+    later jobs if that retry succeeds, since otherwise the input (not the
+    encoder) is the likely culprit.
+    """
+    global _hw_encoder_failed
+
+    enc = encoder or select_encoder()
+    try:
+        subprocess.run(build_cmd(enc), check=True)
+    except subprocess.CalledProcessError:
+        if enc == SOFTWARE_ENCODER or encoder is not None:
+            raise
+        logger.warning("align_service: %s encode failed, retrying with libx264", enc)
+        subprocess.run(build_cmd(SOFTWARE_ENCODER), check=True)
+        with _HW_ENCODER_LOCK:
+            if not _hw_encoder_failed:
+                logger.warning("align_service: disabling %s, using libx264 from now on", enc)
+            _hw_encoder_failed = True
+
+
+def _tpad_filter(pad_start: float, pad_end: float) -> Optional[str]:
+    if pad_start <= 1e-3 and pad_end <= 1e-3:
+        return None
+    params = ["color=black"]
+    if pad_start > 1e-3:
+        params.append("start_mode=add")
+        params.append(f"start_duration={pad_start:.3f}")
+    if pad_end > 1e-3:
+        params.append("stop_mode=add")
+        params.append(f"stop_duration={pad_end:.3f}")
+    return "tpad=" + ":".join(params)
+
 
 def run_ffmpeg(
     video: Path,
@@ -15,6 +122,8 @@ def run_ffmpeg(
     pad_start: float,
     pad_end: float,
     output: Path,
+    threads: Optional[int] = None,
+    encoder: Optional[str] = None,
 ) -> None:
     """
     Encode an aligned video:
@@ -23,57 +132,57 @@ def run_ffmpeg(
     - tpad adds black at head/tail (pad_start/pad_end)
     - entire output is `total_duration` seconds long,
       with the master audio as audio track 1.
+
+    The video encoder defaults to the best available hardware H.264 encoder
+    (see detect_encoder); if that encode fails it is retried with libx264.
+    threads caps libx264's thread count so several encodes can run
+    side by side without oversubscribing the CPU.
+    Output is muxed with -avoid_negative_ts make_zero so the first packet
+    starts at 0 with the audio.
     """
     output.parent.mkdir(parents=True, exist_ok=True)
 
     filters: List[str] = []
-    if pad_start > 1e-3 or pad_end > 1e-3:
-        params = ["color=black"]
-        if pad_start > 1e-3:
-            params.append("start_mode=add")
-            params.append(f"start_duration={pad_start:.3f}")
-        if pad_end > 1e-3:
-            params.append("stop_mode=add")
-            params.append(f"stop_duration={pad_end:.3f}")
-        filters.append("tpad=" + ":".join(params))
-
-    cmd: List[str] = [
-        "ffmpeg",
-        "-hide_banner",
-        "-loglevel",
-        "error",
-        "-y",
-        "-ss",
-        f"{trim_start:.3f}",
-        "-i",
-        str(video),
-        "-i",
-        str(audio),
-    ]
-
-    if filters:
-        cmd += ["-vf", ",".join(filters)]
-
-    cmd += [
-        "-t",
-        f"{total_duration:.3f}",
-        "-map",
-        "0:v:0",
-        "-map",
-        "1:a:0",
-        "-c:v",
-        "libx264",
-        "-preset",
-        "veryfast",
-        "-crf",
-        "20",
-        "-c:a",
-        "aac",
-        "-b:a",
-        "192k",
-        "-shortest",
-        str(output),
-    ]
+    tpad = _tpad_filter(pad_start, pad_end)
+    if tpad:
+        filters.append(tpad)
+
+    def build_cmd(enc: str) -> List[str]:
+        cmd: List[str] = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+        ]
+        if enc != SOFTWARE_ENCODER:
+            # decode on the GPU as well when we encode there
+            cmd += ["-hwaccel", "auto"]
+        cmd += [
+            "-ss",
+            f"{trim_start:.3f}",
+            "-i",
+            str(video),
+            "-i",
+            str(audio),
+        ]
+
+        if filters:
+            cmd += ["-vf", ",".join(filters)]
+
+        cmd += [
+            "-t",
+            f"{total_duration:.3f}",
+            "-map",
+            "0:v:0",
+            "-map",
+            "1:a:0",
+            *_ENCODER_ARGS[enc],
+        ]
+        if threads and enc == SOFTWARE_ENCODER:
+            cmd += ["-threads", str(threads)]
+        cmd += [*_AUDIO_OUT_ARGS, str(output)]
+        return cmd
 
     logger.info(
         "Aligning %s -> %s (trim=%.3fs pad_start=%.3fs pad_end=%.3fs)",
@@ -83,4 +192,106 @@ def run_ffmpeg(
         pad_start,
         pad_end,
     )
-    subprocess.run(cmd, check=True)
+    _encode(build_cmd, encoder)
+
+
+def plan_batches(
+    segments: Sequence[Dict],
+    max_outputs: int = BATCH_MAX_OUTPUTS,
+    max_gap_s: float = BATCH_MAX_GAP_S,
+) -> List[List[Dict]]:
+    """
+    Group one video's segments (run_ffmpeg_batch arguments) into batches whose
+    source windows overlap or lie within max_gap_s of each other, at most
+    max_outputs per batch. Segments with no close neighbour form a batch of
+    one, i.e. a plain per-segment seek and encode.
+    """
+    batches: List[List[Dict]] = []
+    batch_end = 0.0
+    for seg in sorted(segments, key=lambda s: s["trim_start"]):
+        seg_end = seg["trim_start"] + seg["total_duration"]
+        if batches and len(batches[-1]) < max_outputs and seg["trim_start"] <= batch_end + max_gap_s:
+            batches[-1].append(seg)
+            batch_end = max(batch_end, seg_end)
+        else:
+            batches.append([seg])
+            batch_end = seg_end
+    return batches
+
+
+def run_ffmpeg_batch(
+    video: Path,
+    audio: Path,
+    segments: Sequence[Dict],
+    threads: Optional[int] = None,
+    encoder: Optional[str] = None,
+) -> None:
+    """
+    Encode several aligned segments of one video in a single ffmpeg process.
+
+    segments holds the per-clip run_ffmpeg arguments (trim_start,
+    total_duration, pad_start, pad_end, output). Segments in one batch share
+    one input open and one decode: the video is split in a filter graph and each branch is trimmed, padded
+    and encoded to its own output. Only segments whose source windows are close
+    together share a process (see plan_batches); the others are encoded on
+    their own with an accurate seek.
+    """
+    for seg in segments:
+        seg["output"].parent.mkdir(parents=True, exist_ok=True)
+
+    max_outputs = BATCH_MAX_OUTPUTS
+    if (encoder or select_encoder()) != SOFTWARE_ENCODER:
+        max_outputs = min(max_outputs, HW_MAX_ENCODE_SESSIONS)
+
+    for chunk in plan_batches(segments, max_outputs=max_outputs):
+        if len(chunk) == 1:
+            run_ffmpeg(video, audio, **chunk[0], threads=threads, encoder=encoder)
+            continue
+
+        # seek the input to the earliest trim point (floored to the ms so no
+        # branch gets a negative trim), then trim each branch relative to it
+        base = math.floor(min(seg["trim_start"] for seg in chunk) * 1000) / 1000
+        graph = [f"[0:v:0]split={len(chunk)}" + "".join(f"[s{n}]" for n in range(len(chunk)))]
+        for n, seg in enumerate(chunk):
+            chain = [f"trim=start={seg['trim_start'] - base:.6f}", "setpts=PTS-STARTPTS"]
+            tpad = _tpad_filter(seg["pad_start"], seg["pad_end"])
+            if tpad:
+                chain.append(tpad)
+            graph.append(f"[s{n}]" + ",".join(chain) + f"[v{n}]")
+
+        def build_cmd(enc: str) -> List[str]:
+            cmd: List[str] = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+            if enc != SOFTWARE_ENCODER:
+                cmd += ["-hwaccel", "auto"]
+            cmd += [
+                "-ss",
+                f"{base:.3f}",
+                "-i",
+                str(video),
+                "-i",
+                str(audio),
+                "-filter_complex",
+                ";".join(graph),
+            ]
+            for n, seg in enumerate(chunk):
+                cmd += [
+                    "-map",
+                    f"[v{n}]",
+                    "-map",
+                    "1:a:0",
+                    "-t",
+                    f"{seg['total_duration']:.3f}",
+                    *_ENCODER_ARGS[enc],
+                ]
+                if threads and enc == SOFTWARE_ENCODER:
+                    cmd += ["-threads", str(threads)]
+                cmd += [*_AUDIO_OUT_ARGS, str(seg["output"])]
+            return cmd
+
+        logger.info(
+            "Aligning %d segments of %s in one pass (%s)",
+            len(chunk),
+            video,
+            ", ".join(seg["output"].name for seg in chunk),
+        )
+        _encode(build_cmd, encoder)
@@ -1,11 +1,12 @@
-import subprocess, wave, numpy as np
-from scipy.signal import fftconvolve
+import glob, hashlib, os, subprocess, tempfile, wave, numpy as np
+from functools import lru_cache
+from scipy.signal import butter, oaconvolve, sosfiltfilt
 from pathlib import Path
 from .config import FS, FADE_MS
-import numpy as np
-import wave
-from pathlib import Path
-from scipy.signal import butter, filtfilt
+try:
+    from cue_detection.audio import _decode_pcm_mono, _read_pcm
+except ImportError:  # pragma: no cover - workspace fallback
+    from packages.python.cue_detection.audio import _decode_pcm_mono, _read_pcm
 
 VIDEO_EXT = {".mp4", ".mov", ".mkv", ".avi", ".m4v"}
 AUDIO_EXT = {".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg"}
@@ -28,47 +29,69 @@ def extract_audio_48k(infile, tmpwav):
     cmd = ["ffmpeg", "-y", "-i", infile, "-ac", "1", "-ar", str(FS), "-vn", "-f", "wav", tmpwav]
     run_ffmpeg(cmd)
 
-def get_media_duration(infile):
+@lru_cache(maxsize=512)
+def _media_duration_at(infile, mtime_ns, size):
+    # raises on failure, so only successful probes are memoized
     cmd = [
         "ffprobe", "-v", "error", "-show_entries", "format=duration",
         "-of", "default=noprint_wrappers=1:nokey=1", infile,
     ]
     proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    return float(proc.stdout.strip())
+
+def get_media_duration(infile):
+    """ffprobe duration in seconds (None if unknown); memoized while the file is unchanged."""
     try:
-        return float(proc.stdout.strip())
+        path = os.path.abspath(infile)
+        st = os.stat(path)
+        return _media_duration_at(path, st.st_mtime_ns, st.st_size)
     except Exception:
         return None
 
 
 
+@lru_cache(maxsize=8)
+def _bandpass_sos(fs, low_hz, high_hz, order=3):
+    return butter(order, [low_hz / (fs / 2), high_hz / (fs / 2)], btype="band", output="sos")
+
+
 def read_wav_mono(path: Path, apply_bandpass: bool = True):
-    with wave.open(str(path), "rb") as wf:
-        fs = wf.getframerate()
-        ch = wf.getnchannels()
-        sw = wf.getsampwidth()
-        n = wf.getnframes()
-        raw = wf.readframes(n)
+    raw, fs, ch, sw = _read_pcm(path)
 
     # --- decode PCM ---
-    if sw == 1:
-        x = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0) / 128.0
-    elif sw == 2:
-        x = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
-    else:
-        x = np.frombuffer(raw, np.int32).astype(np.float32) / (2**31)
-
-    if ch > 1:
-        x = x.reshape(-1, ch).mean(axis=1)
+    x = _decode_pcm_mono(raw, sw, ch)
+    del raw
 
     # --- optional band-pass filter (helps detect 2–3 kHz cues) ---
     if apply_bandpass:
         low_hz, high_hz = 800, 3500       # works for both 2.4 kHz and 3.2 kHz cues
-        b, a = butter(3, [low_hz / (fs / 2), high_hz / (fs / 2)], btype="band")
-        x = filtfilt(b, a, x)
+        x = sosfiltfilt(_bandpass_sos(fs, low_hz, high_hz), x).astype(np.float32)  # filter runs in float64
 
     return x, fs
 
 
+def read_media_mono(infile, apply_bandpass: bool = True):
+    """
+    Mono float32 samples of any media file at FS.
+
+    A PCM WAV that is already at FS (mono or stereo) is read in place; anything
+    else is decoded by ffmpeg to a temporary WAV first.
+    """
+    if Path(infile).suffix.lower() == ".wav":
+        try:
+            with wave.open(str(infile), "rb") as wf:
+                direct = wf.getframerate() == FS and wf.getnchannels() <= 2 and wf.getsampwidth() in (1, 2, 4)
+        except (wave.Error, EOFError, OSError):
+            direct = False  # e.g. float WAV: let ffmpeg convert it
+        if direct:
+            return read_wav_mono(Path(infile), apply_bandpass)
+
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td) / "audio.wav"
+        extract_audio_48k(str(infile), tmp)
+        return read_wav_mono(tmp, apply_bandpass)
+
+
 def fade(x, ms=FADE_MS, fs=FS):
     n = max(1, int(ms * fs / 1000))
     ramp = np.linspace(0, 1, n, dtype=np.float32)
@@ -76,29 +99,44 @@ def fade(x, ms=FADE_MS, fs=FS):
     x[-n:] *= ramp[::-1]
     return x
 
-def norm(x): return (x - np.mean(x)) / (np.std(x) + 1e-8)
+def norm(x):
+    # one centered copy scaled in place (np.std would center a second copy)
+    y = x - np.mean(x)
+    y /= np.sqrt(np.mean(y * y)) + 1e-8
+    return y
 
 def xcorr_valid(ref, rec):
-    r = fftconvolve(norm(rec), norm(ref[::-1]), mode="valid")
+    # overlap-add: blocks sized to the short ref instead of one FFT over all of rec
+    r = oaconvolve(norm(rec), norm(ref[::-1]), mode="valid")
     r /= max(1, len(ref))
     return r
 
 
-
-import subprocess
-import tempfile
-from pathlib import Path
-import numpy as np
-import wave
-
-FS = 48000
-
 def ensure_wav_48k(infile: Path) -> Path:
-    """If file is not WAV, decode it to temporary mono 48 kHz WAV."""
+    """
+    If file is not WAV, decode it to temporary mono 48 kHz WAV.
+
+    The decoded file is keyed on (path, mtime, size), so an unchanged source
+    is only transcoded once. Older decodes of the same stem are removed when a
+    new one is written, so there is still one file per stem.
+    """
     if infile.suffix.lower() == ".wav":
         return infile
 
-    tmp = Path(tempfile.gettempdir()) / f"decoded_{infile.stem}.wav"
+    st = infile.stat()
+    key = hashlib.sha1(f"{infile}|{st.st_mtime_ns}|{st.st_size}".encode()).hexdigest()[:16]
+    target = Path(tempfile.gettempdir()) / f"decoded_{infile.stem}_{key}.wav"
+    try:
+        if target.stat().st_size > 0:
+            return target
+    except FileNotFoundError:
+        pass
+
+    # decode next to the target, then move into place so readers never see a
+    # partial file; the temp name is unique per call (threads share the pid)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.stem}.", suffix=".tmp.wav", dir=target.parent)
+    os.close(fd)
+    tmp = Path(tmp_name)
     cmd = [
         "ffmpeg", "-y",
         "-i", str(infile),
@@ -107,28 +145,28 @@ def ensure_wav_48k(infile: Path) -> Path:
         "-vn",
         str(tmp)
     ]
-    subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    return tmp
+    try:
+        # a failed decode must not be promoted to the cache
+        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    stale = f"decoded_{glob.escape(infile.stem)}_" + "?" * len(key) + ".wav"
+    for old in target.parent.glob(stale):
+        if old != target:
+            try:
+                old.unlink()
+            except OSError:
+                pass  # e.g. still open on Windows; retried on the next write
+    return target
 
 
 def read_wav_mono_any(infile: Path):
     """Reads any audio (WAV/MP3/M4A) as mono float32 @ 48 kHz."""
     wav_path = ensure_wav_48k(infile)
 
-    with wave.open(str(wav_path), "rb") as wf:
-        fs = wf.getframerate()
-        ch = wf.getnchannels()
-        sw = wf.getsampwidth()
-        n = wf.getnframes()
-        raw = wf.readframes(n)
-
-    if sw == 1:
-        x = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128.0) / 128.0
-    elif sw == 2:
-        x = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
-    else:
-        x = np.frombuffer(raw, np.int32).astype(np.float32) / (2**31)
-
-    if ch > 1:
-        x = x.reshape(-1, ch).mean(axis=1)
+    raw, fs, ch, sw = _read_pcm(wav_path)
+    x = _decode_pcm_mono(raw, sw, ch)
     return x, fs
@@ -11,3 +11,5 @@ FS = 48000
 THRESHOLD = 0.6  # instead of 0.9
 MIN_GAP_S = 0.25
 FADE_MS = 8
+# cue search: correlate at FS / 3 first, full rate only near candidate lags
+COARSE_FACTOR = 3
@@ -9,14 +9,14 @@ a global tqdm progress bar with optional inner logging.
 
 import sys
 import time
-import tempfile
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from pymongo import MongoClient
 from tqdm import tqdm
 
-from .config import MONGO_URI, INPUT_PATH, REF_DIR, THRESHOLD, MIN_GAP_S, FS
-from .audio_utils import has_ffmpeg, extract_audio_48k, read_wav_mono, get_media_duration
+from .config import MONGO_URI, INPUT_PATH, REF_DIR, THRESHOLD, MIN_GAP_S, FS, COARSE_FACTOR
+from .audio_utils import has_ffmpeg, read_media_mono, get_media_duration
 try:
     from cue_detection import gather_reference_library, compute_matches, build_segments
 except ImportError:  # pragma: no cover - workspace fallback
@@ -31,6 +31,7 @@ VIDEO_EXT = {".mp4", ".mov", ".mkv", ".avi", ".m4v"}
 AUDIO_EXT = {".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg"}
 
 VERBOSE = True  # set to False for silent inner logging
+MAX_PARALLEL_FILES = 2  # files processed at once (see PostprocessService)
 
 # =============================================================
 # === Helpers ===
@@ -49,38 +50,32 @@ def iter_media(path):
 def process_one(infile, refs, verbose=VERBOSE):
     """Extract audio, detect cues, build segments, and return result dict."""
     t0 = time.perf_counter()
-    with tempfile.TemporaryDirectory() as td:
-        tmp = Path(td) / "audio.wav"
-
-        if verbose:
-            tqdm.write(f"⏳ Extracting audio from {Path(infile).name} ...")
-        extract_audio_48k(infile, tmp)
-
-        if verbose:
-            tqdm.write("🎵 Reading waveform ...")
-        rec, fs = read_wav_mono(tmp)
-
-        if verbose:
-            tqdm.write("🔍 Detecting cue matches ...")
-        matches = compute_matches(rec, refs, THRESHOLD, MIN_GAP_S)
-
-        duration = get_media_duration(infile) or len(rec) / FS
-        segs = build_segments(matches["start"], matches["end"], duration)
-        cue_ids = sorted(
-            set([h["ref_id"] for h in matches["start"]] + [h["ref_id"] for h in matches["end"]])
-        )
-
-        elapsed = time.perf_counter() - t0
-        if verbose:
-            tqdm.write(f"✅ {len(segs)} segment(s) detected in {elapsed:.1f}s\n")
-
-        return {
-            "file": infile,
-            "duration_s": duration,
-            "segments": segs,
-            "cue_refs_used": cue_ids,
-            "notes": [],
-        }
+
+    if verbose:
+        tqdm.write(f"⏳ Reading audio from {Path(infile).name} ...")
+    rec, fs = read_media_mono(infile)
+
+    if verbose:
+        tqdm.write("🔍 Detecting cue matches ...")
+    matches = compute_matches(rec, refs, THRESHOLD, MIN_GAP_S, coarse_factor=COARSE_FACTOR)
+
+    duration = get_media_duration(infile) or len(rec) / FS
+    segs = build_segments(matches["start"], matches["end"], duration)
+    cue_ids = sorted(
+        set([h["ref_id"] for h in matches["start"]] + [h["ref_id"] for h in matches["end"]])
+    )
+
+    elapsed = time.perf_counter() - t0
+    if verbose:
+        tqdm.write(f"✅ {len(segs)} segment(s) detected in {elapsed:.1f}s\n")
+
+    return {
+        "file": infile,
+        "duration_s": duration,
+        "segments": segs,
+        "cue_refs_used": cue_ids,
+        "notes": [],
+    }
 
 # =============================================================
 # === Main Entry ===
@@ -105,14 +100,17 @@ def main():
     print(f"🔍 Found {len(inputs)} media file(s). Starting postprocessing...\n")
 
     # --- global tqdm bar ---
-    for f in tqdm(inputs, desc="Processing files", unit="file", ncols=100, colour="cyan"):
-        try:
-            tqdm.write(f"🎧 {Path(f).name}")
-            res = process_one(f, refs)
-            insert_postprocessing_result(client, res)
-        except Exception as e:
-            tqdm.write(f"⚠️ Error processing {f}: {e}")
-            traceback.print_exc()
+    with ThreadPoolExecutor(max_workers=min(len(inputs), MAX_PARALLEL_FILES)) as pool:
+        futures = {pool.submit(process_one, f, refs): f for f in inputs}
+        for fut in tqdm(as_completed(futures), total=len(futures), desc="Processing files", unit="file", ncols=100, colour="cyan"):
+            f = futures[fut]
+            try:
+                res = fut.result()
+                tqdm.write(f"🎧 {Path(f).name}")
+                insert_postprocessing_result(client, res)
+            except Exception as e:
+                tqdm.write(f"⚠️ Error processing {f}: {e}")
+                traceback.print_exc()
 
     print("\n✅ All files processed successfully.")
 
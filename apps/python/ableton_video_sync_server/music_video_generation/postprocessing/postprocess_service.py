@@ -2,23 +2,29 @@ from __future__ import annotations
 
 import json
 import threading
-import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from loguru import logger
 
-from .audio_utils import has_ffmpeg, extract_audio_48k, read_wav_mono, get_media_duration
+from .audio_utils import has_ffmpeg, read_media_mono, get_media_duration
 try:
     from cue_detection import gather_reference_library, compute_matches, build_segments
 except ImportError:  # pragma: no cover - workspace fallback
     from packages.python.cue_detection import gather_reference_library, compute_matches, build_segments
-from .config import THRESHOLD, MIN_GAP_S, FS
+from .config import THRESHOLD, MIN_GAP_S, FS, COARSE_FACTOR
 
 MEDIA_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".m4v", ".mp3", ".wav", ".m4a", ".flac", ".aac", ".ogg"}
 
+# Media files processed at once. Extraction is an ffmpeg subprocess and the
+# correlation FFTs release the GIL, so threads suffice; compute_matches is
+# already multi-threaded per file and each file holds its decoded audio,
+# so this stays small.
+MAX_PARALLEL_FILES = 2
+
 
 class PostprocessService:
     def __init__(self) -> None:
@@ -244,34 +250,35 @@ class PostprocessService:
         refs = gather_reference_library(refs_dir)
         track_map = self._load_track_map(root)
 
-        media_results: List[Dict] = []
         job["progress"] = {"processed": 0, "total": len(media_files)}
 
-        for index, file_path in enumerate(media_files, start=1):
-            job["progress"]["processed"] = index - 1
+        def process(file_path: Path) -> Dict:
             try:
-                media_results.append(self._process_file(file_path, refs, root, params, track_map))
+                result = self._process_file(file_path, refs, root, params, track_map)
             except Exception as exc:
                 import traceback
                 logger.warning(f"postprocess: failed to process {file_path}: {exc}\n{traceback.format_exc()}")
-                media_results.append(
-                    {
-                        "file": str(file_path),
-                        "relative_path": str(file_path.relative_to(root)),
-                        "duration_s": None,
-                        "segments": [],
-                        "cue_refs_used": [],
-                        "start_hits": [],
-                        "end_hits": [],
-                        "notes": [f"error: {exc}"],
-                        "media_type": file_path.suffix.lower(),
-                        "top_score": None,
-                        "track_names": [],
-                    }
-                )
-            job["progress"]["processed"] = index
-
-        return media_results
+                result = {
+                    "file": str(file_path),
+                    "relative_path": str(file_path.relative_to(root)),
+                    "duration_s": None,
+                    "segments": [],
+                    "cue_refs_used": [],
+                    "start_hits": [],
+                    "end_hits": [],
+                    "notes": [f"error: {exc}"],
+                    "media_type": file_path.suffix.lower(),
+                    "top_score": None,
+                    "track_names": [],
+                }
+            with self._lock:
+                job["progress"]["processed"] += 1
+            return result
+
+        # results keep the media_files order regardless of completion order
+        workers = min(len(media_files), MAX_PARALLEL_FILES)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(process, media_files))
 
     def _process_file(
         self,
@@ -282,13 +289,12 @@ class PostprocessService:
         track_map: Dict[str, List[str]],
     ) -> Dict:
         t0 = time.perf_counter()
-        with tempfile.TemporaryDirectory() as td:
-            tmp = Path(td) / "audio.wav"
-            extract_audio_48k(str(file_path), tmp)
-            rec, _fs = read_wav_mono(tmp)
+        rec, _fs = read_media_mono(file_path)
         duration = get_media_duration(str(file_path)) or len(rec) / FS
         logger.info("postprocess45: computing matches for %s", file_path)
-        matches = compute_matches(rec, refs, params["threshold"], params["min_gap_s"])
+        matches = compute_matches(
+            rec, refs, params["threshold"], params["min_gap_s"], coarse_factor=COARSE_FACTOR
+        )
 
         def _attach_tracks(hit_list: List[Dict]) -> None:
             for hit in hit_list:
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None
+
+
+_AUDIO_MEDIA_TYPES = frozenset({"mp3", "wav", "m4a", "aac", "flac", "ogg"})
 
 
 class ProjectDataNotFound(Exception):
     """Raised when recordings.json / postprocess_matches.json are missing or broken."""
 
 
+def _load_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=32)
+def _load_json_at(path_str: str, mtime_ns: int, size: int) -> Any:
+    # keyed on the file's stat, so every ProjectFiles on the same root shares
+    # one parse until the file changes; callers must not mutate the result
+    return _load_json(Path(path_str))
+
+
+def _cue_key(path: Optional[str]) -> str:
+    return os.path.basename(path).lower() if path else ""
+
+
 @dataclass
 class RecordingInfo:
     project_name: str
@@ -51,6 +78,15 @@ class ProjectFiles:
         self.project_root = Path(project_root)
         self._recordings_raw: Optional[Dict[str, Any]] = None
         self._postproc_raw: Optional[Dict[str, Any]] = None
+        # parsed entries and lookup indices, built once per loaded file
+        self._recordings: Optional[List[RecordingInfo]] = None
+        self._media: Optional[List[MediaInfo]] = None
+        self._recording_by_project: Optional[Dict[str, RecordingInfo]] = None
+        # keyed by lowercased cue basename
+        self._recording_by_cue: Optional[Dict[str, RecordingInfo]] = None
+        self._media_by_cue: Optional[Dict[str, List[MediaInfo]]] = None
+        # (lowercased file basename, entry) for audio media, in file order
+        self._audio_media: Optional[List[Tuple[str, MediaInfo]]] = None
 
     # ------------------- low-level loaders -------------------
 
@@ -64,10 +100,12 @@ class ProjectFiles:
         if self._recordings_raw is not None:
             return self._recordings_raw
         path = self._recordings_path()
-        if not path.exists():
-            raise ProjectDataNotFound(f"recordings.json not found at {path}")
         try:
-            self._recordings_raw = json.loads(path.read_text(encoding="utf-8"))
+            st = path.stat()
+        except FileNotFoundError:
+            raise ProjectDataNotFound(f"recordings.json not found at {path}") from None
+        try:
+            self._recordings_raw = _load_json_at(str(path.resolve()), st.st_mtime_ns, st.st_size)
             return self._recordings_raw
         except Exception as exc:
             raise ProjectDataNotFound(f"Failed to read recordings.json at {path}: {exc}") from exc
@@ -76,10 +114,12 @@ class ProjectFiles:
         if self._postproc_raw is not None:
             return self._postproc_raw
         path = self._postprocess_path()
-        if not path.exists():
-            raise ProjectDataNotFound(f"postprocess_matches.json not found at {path}")
         try:
-            self._postproc_raw = json.loads(path.read_text(encoding="utf-8"))
+            st = path.stat()
+        except FileNotFoundError:
+            raise ProjectDataNotFound(f"postprocess_matches.json not found at {path}") from None
+        try:
+            self._postproc_raw = _load_json_at(str(path.resolve()), st.st_mtime_ns, st.st_size)
             return self._postproc_raw
         except Exception as exc:
             raise ProjectDataNotFound(f"Failed to read postprocess_matches.json at {path}: {exc}") from exc
@@ -87,24 +127,27 @@ class ProjectFiles:
     # ------------------- recordings.json -------------------
 
     def list_recordings(self) -> List[RecordingInfo]:
-        raw = self._load_recordings_raw()
-        recs = []
-        for item in raw.get("recordings", []):
-            recs.append(
-                RecordingInfo(
-                    project_name=item.get("project_name", ""),
-                    file_path=item.get("file_path", ""),
-                    bpm_at_start=float(item.get("bpm_at_start", 120.0)),
-                    ts_num=int(item.get("ts_num", 4)),
-                    ts_den=int(item.get("ts_den", 4)),
-                    start_sound_path=item.get("start_sound_path"),
-                    end_sound_path=item.get("end_sound_path"),
-                    start_recording_bar=item.get("start_recording_bar"),
-                    end_recording_bar=item.get("end_recording_bar"),
-                    duration_seconds=self._compute_duration_from_times(item),
-                )
-            )
-        return recs
+        return list(self._cached_recordings())
+
+    def _cached_recordings(self) -> List[RecordingInfo]:
+        if self._recordings is None:
+            raw = self._load_recordings_raw()
+            self._recordings = [self._recording_info(item) for item in raw.get("recordings", [])]
+        return self._recordings
+
+    def _recording_info(self, item: Dict[str, Any]) -> RecordingInfo:
+        return RecordingInfo(
+            project_name=item.get("project_name", ""),
+            file_path=item.get("file_path", ""),
+            bpm_at_start=float(item.get("bpm_at_start", 120.0)),
+            ts_num=int(item.get("ts_num", 4)),
+            ts_den=int(item.get("ts_den", 4)),
+            start_sound_path=item.get("start_sound_path"),
+            end_sound_path=item.get("end_sound_path"),
+            start_recording_bar=item.get("start_recording_bar"),
+            end_recording_bar=item.get("end_recording_bar"),
+            duration_seconds=self._compute_duration_from_times(item),
+        )
 
     def _compute_duration_from_times(self, item: Dict[str, Any]) -> Optional[float]:
         try:
@@ -117,9 +160,14 @@ class ProjectFiles:
         return None
 
     def get_recording_by_project(self, project_name: str) -> RecordingInfo:
-        for rec in self.list_recordings():
-            if rec.project_name == project_name:
-                return rec
+        if self._recording_by_project is None:
+            index: Dict[str, RecordingInfo] = {}
+            for rec in self._cached_recordings():
+                index.setdefault(rec.project_name, rec)  # first entry wins, as in a linear scan
+            self._recording_by_project = index
+        rec = self._recording_by_project.get(project_name)
+        if rec is not None:
+            return rec
         raise ProjectDataNotFound(f"No recording found for project_name={project_name!r} in recordings.json")
 
     def find_recording_by_cue(self, ref_id: str) -> Optional[RecordingInfo]:
@@ -127,63 +175,71 @@ class ProjectFiles:
         Match a cue ref like 'start_20251119_214005_531.wav' against
         start_sound_path / end_sound_path basenames.
         """
-        ref_id_lower = ref_id.lower()
-        for rec in self.list_recordings():
-            start = (rec.start_sound_path or "").lower()
-            end = (rec.end_sound_path or "").lower()
-            if ref_id_lower in start or ref_id_lower in end:
-                return rec
-        return None
+        if self._recording_by_cue is None:
+            index: Dict[str, RecordingInfo] = {}
+            for rec in self._cached_recordings():
+                for path in (rec.start_sound_path, rec.end_sound_path):
+                    key = _cue_key(path)
+                    if key:
+                        index.setdefault(key, rec)  # first recording wins
+            self._recording_by_cue = index
+        return self._recording_by_cue.get(_cue_key(ref_id))
 
     # ------------------- postprocess_matches.json -------------------
 
     def list_media(self) -> List[MediaInfo]:
-        raw = self._load_postproc_raw()
-        items = []
-        for m in raw.get("media", []):
-            items.append(
-                MediaInfo(
-                    file=m.get("file", ""),
-                    relative_path=m.get("relative_path", ""),
-                    duration_s=float(m.get("duration_s", 0.0) or 0.0),
-                    segments=m.get("segments", []) or [],
-                    cue_refs_used=m.get("cue_refs_used", []) or [],
-                    start_hits=m.get("start_hits", []) or [],
-                    end_hits=m.get("end_hits", []) or [],
-                    media_type=m.get("media_type", ""),
-                )
-            )
-        return items
+        return list(self._cached_media())
+
+    def _cached_media(self) -> List[MediaInfo]:
+        if self._media is None:
+            raw = self._load_postproc_raw()
+            self._media = [self._media_info(m) for m in raw.get("media", [])]
+        return self._media
+
+    @staticmethod
+    def _media_info(m: Dict[str, Any]) -> MediaInfo:
+        return MediaInfo(
+            file=m.get("file", ""),
+            relative_path=m.get("relative_path", ""),
+            duration_s=float(m.get("duration_s", 0.0) or 0.0),
+            segments=m.get("segments", []) or [],
+            cue_refs_used=m.get("cue_refs_used", []) or [],
+            start_hits=m.get("start_hits", []) or [],
+            end_hits=m.get("end_hits", []) or [],
+            media_type=m.get("media_type", ""),
+        )
 
     def find_media_by_cue(self, ref_id: str) -> List[MediaInfo]:
         """
         Return all media entries whose cue_refs_used contains ref_id (by basename).
         """
-        ref_id_lower = ref_id.lower()
-        result: List[MediaInfo] = []
-        for m in self.list_media():
-            if any(ref_id_lower in (c or "").lower() for c in m.cue_refs_used):
-                result.append(m)
-        return result
+        if self._media_by_cue is None:
+            index: Dict[str, List[MediaInfo]] = {}
+            for m in self._cached_media():
+                for key in {_cue_key(c) for c in m.cue_refs_used} - {""}:
+                    index.setdefault(key, []).append(m)
+            self._media_by_cue = index
+        return list(self._media_by_cue.get(_cue_key(ref_id), ()))
 
     def get_audio_media_for_project(self, project_name: str) -> Optional[MediaInfo]:
         """
         Best-effort choice of the main audio track for a project.
         For now: first media item whose file name starts with project_name and is an audio type.
         """
+        if self._audio_media is None:
+            self._audio_media = [
+                (Path(m.file).name.lower(), m)
+                for m in self._cached_media()
+                if m.media_type.lower() in _AUDIO_MEDIA_TYPES
+            ]
+        if not self._audio_media:
+            return None
         name_lower = project_name.lower()
-        candidates = []
-        for m in self.list_media():
-            base = Path(m.file).name.lower()
-            if base.startswith(name_lower) and m.media_type.lower() in {"mp3", "wav", "m4a", "aac", "flac", "ogg"}:
-                candidates.append(m)
-        if candidates:
-            return candidates[0]
-        # fallback: first audio entry at all
-        for m in self.list_media():
-            if m.media_type.lower() in {"mp3", "wav", "m4a", "aac", "flac", "ogg"}:
+        for base, m in self._audio_media:
+            if base.startswith(name_lower):
                 return m
-        return None
+        # fallback: first audio entry at all
+        return self._audio_media[0][1]
 
 
 # ------------------- helper factory -------------------
@@ -200,8 +256,23 @@ def get_project_root_from_any_path(path: Path) -> Path:
            ableton/
            ...
 
+
+    Found roots are cached per path (misses are not), so repeated lookups for
+    the same media skip the resolve and the stat per ancestor. A cached root
+    whose recordings.json has since disappeared is looked up again.
     """
-    path = path.resolve()
+    abs_path = os.path.abspath(path)
+    root = _project_root_for(abs_path)
+    if not (root / "recordings.json").exists():
+        # project moved or deleted since it was cached
+        _project_root_for.cache_clear()
+        root = _project_root_for(abs_path)
+    return root
+
+
+@lru_cache(maxsize=256)
+def _project_root_for(abs_path: str) -> Path:
+    path = Path(abs_path).resolve()
     for parent in [path] + list(path.parents):
         if (parent / "recordings.json").exists():
             return parent
@@ -210,6 +281,9 @@ def get_project_root_from_any_path(path: Path) -> Path:
 
 def make_store(project_root: Optional[str | Path] = None, hint_path: Optional[Path] = None) -> ProjectFiles:
     if project_root is not None:
+        # an explicit root may be a project created (or moved) since roots
+        # were last cached for paths below it
+        _project_root_for.cache_clear()
         return ProjectFiles(project_root)
     if hint_path is not None:
         root = get_project_root_from_any_path(hint_path)
@@ -215,6 +215,10 @@ class AlignFootageRequest(BaseModel):
         default=None,
         description="Optional override for the soundtrack to align against.",
     )
+    debug: bool = Field(
+        default=False,
+        description="Include per-segment debug rows in the alignment result.",
+    )
 
 
 class VideoGenSyncRequest(BaseModel):
@@ -539,7 +543,11 @@ def postprocess_reset(payload: ProjectPathRequest) -> dict:
 @app.post("/align/footage")
 def align_footage(payload: AlignFootageRequest) -> dict:
     try:
-        return align_service.align(payload.project_path, audio_path=payload.audio_path)
+        return align_service.align(
+            payload.project_path,
+            audio_path=payload.audio_path,
+            debug=payload.debug,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -547,9 +555,12 @@ def align_footage(payload: AlignFootageRequest) -> dict:
 
 
 @app.get("/align/state")
-def align_state(project_path: str = Query(..., description="Absolute path to the active project.")) -> dict:
+def align_state(
+    project_path: str = Query(..., description="Absolute path to the active project."),
+    include_debug: bool = Query(False, description="Inline debug rows stored in debug.jsonl."),
+) -> dict:
     try:
-        return align_service.state(project_path)
+        return align_service.state(project_path, include_debug=include_debug)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
@@ -0,0 +1,61 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+SERVER_SRC = ROOT / "apps" / "python" / "ableton_video_sync_server"
+for path in (ROOT, SERVER_SRC):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from music_video_generation.postprocessing.align_service.alignment_core import (
+    compute_segment_alignment,
+    compute_segment_alignment_batch,
+)
+
+FIELDS = ("relative_offset", "trim_start", "pad_start", "used_duration", "pad_end")
+
+
+def _random_case(rng: random.Random):
+    # mix round values (exact ties, zero-length segments) with arbitrary ones
+    def value():
+        return rng.choice([0.0, 1.0, 2.5, 10.0, rng.uniform(0, 60), round(rng.uniform(0, 60), 1)])
+
+    n = rng.randint(1, 20)
+    seg_starts = [value() for _ in range(n)]
+    seg_ends = [rng.choice([None, value()]) for _ in range(n)]
+    video_durations = [value() for _ in range(n)]
+    audio_cue = rng.choice([0.0, 2.5, rng.uniform(0, 20)])
+    audio_duration = rng.choice([0.0, 30.0, rng.uniform(0, 90)])
+    return seg_starts, seg_ends, video_durations, audio_cue, audio_duration
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_alignment_matches_scalar(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        seg_starts, seg_ends, video_durations, audio_cue, audio_duration = _random_case(rng)
+
+        batch = compute_segment_alignment_batch(
+            seg_starts=seg_starts,
+            seg_ends=[np.nan if end is None else end for end in seg_ends],
+            audio_cue=audio_cue,
+            audio_duration=audio_duration,
+            video_durations=video_durations,
+        )
+        batch = {key: batch[key].tolist() for key in FIELDS}
+
+        for j, (start, end, video_duration) in enumerate(zip(seg_starts, seg_ends, video_durations)):
+            scalar = compute_segment_alignment(
+                seg_start=start,
+                seg_end=end,
+                audio_cue=audio_cue,
+                audio_duration=audio_duration,
+                video_duration=video_duration,
+            )
+            for key in FIELDS:
+                # repr: bit-identical, including the sign of zero
+                assert repr(batch[key][j]) == repr(getattr(scalar, key)), (key, j)
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+SERVER_SRC = ROOT / "apps" / "python" / "ableton_video_sync_server"
+for path in (ROOT, SERVER_SRC):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+try:
+    from cue_detection import detection
+    from cue_detection.audio import _bandpass
+    from cue_library import barker_bpsk, unique_cue
+except ImportError:  # pragma: no cover - fallback for legacy layout
+    from packages.python.cue_detection import detection
+    from packages.python.cue_detection.audio import _bandpass
+    from packages.python.cue_library import barker_bpsk, unique_cue
+
+FS = 48_000
+
+
+@pytest.fixture(autouse=True)
+def no_debug_plots(monkeypatch):
+    # compute_matches always asks for debug plots; keep the test from writing PNGs
+    monkeypatch.setattr(detection, "_plot_correlation_debug", lambda **kwargs: None)
+
+
+def _synthetic_recording(seed):
+    rng = np.random.default_rng(seed)
+    refs = {
+        "start": [
+            {"id": f"start_{i}.wav", "samples": unique_cue(100 * seed + i, length=0.5).astype(np.float32)}
+            for i in range(3)
+        ],
+        "end": [{"id": "end_barker.wav", "samples": barker_bpsk(fs=FS).astype(np.float32)}],
+    }
+    rec = (rng.standard_normal(FS * 30) * 0.4).astype(np.float32)
+    placed = []
+    for k, at_s in enumerate((2.0, 9.5, 17.25, 24.0)):
+        kind = "end" if k == 3 else "start"
+        ref = refs[kind][0 if kind == "end" else k]
+        start = int(at_s * FS)
+        rec[start : start + ref["samples"].size] += ref["samples"] * rng.uniform(0.3, 1.0)
+        placed.append((kind, ref["id"], at_s))
+    return _bandpass(rec, FS), refs, placed
+
+
+def _hits(matches):
+    return {kind: [(h["ref_id"], h["time_s"]) for h in hits] for kind, hits in matches.items()}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_compute_matches_finds_placed_cues(seed):
+    rec, refs, placed = _synthetic_recording(seed)
+
+    found = _hits(detection.compute_matches(rec, refs, 0.6, 0.25))
+
+    for kind, ref_id, at_s in placed:
+        assert any(r == ref_id and abs(t - at_s) < 1e-3 for r, t in found[kind]), (kind, ref_id, at_s)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_coarse_to_fine_matches_full_correlation(seed):
+    rec, refs, _ = _synthetic_recording(seed)
+
+    full = detection.compute_matches(rec, refs, 0.6, 0.25)
+    coarse = detection.compute_matches(rec, refs, 0.6, 0.25, coarse_factor=3)
+
+    assert _hits(coarse) == _hits(full)
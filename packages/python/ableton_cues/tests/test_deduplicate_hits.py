@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+SERVER_SRC = ROOT / "apps" / "python" / "ableton_video_sync_server"
+for path in (ROOT, SERVER_SRC):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+try:
+    from cue_detection import deduplicate_hits
+except ImportError:  # pragma: no cover - fallback for legacy layout
+    from packages.python.cue_detection import deduplicate_hits
+
+
+def _reference_deduplicate(hits, tol_s=0.2):
+    # the original sorted-scan implementation
+    if not hits:
+        return []
+    ordered = sorted(hits, key=lambda h: h["time_s"])
+    deduped = [ordered[0]]
+    for hit in ordered[1:]:
+        if abs(hit["time_s"] - deduped[-1]["time_s"]) > tol_s:
+            deduped.append(hit)
+    return deduped
+
+
+def test_deduplicate_hits_empty():
+    assert deduplicate_hits([]) == []
+
+
+def test_deduplicate_hits_keeps_first_of_equal_times():
+    hits = [{"time_s": 1.0, "i": 0}, {"time_s": 1.0, "i": 1}, {"time_s": 0.5, "i": 2}]
+    assert [h["i"] for h in deduplicate_hits(hits, tol_s=0.2)] == [2, 0]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_deduplicate_hits_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(500):
+        n = int(rng.integers(0, 40))
+        if trial % 2:
+            # coarse grid: many exact ties and gaps right at tol_s
+            times = [x * 0.1 for x in rng.integers(0, 30, n).tolist()]
+        else:
+            times = np.round(rng.uniform(0, 3, n), int(rng.integers(1, 4))).tolist()
+        hits = [{"time_s": t, "i": i} for i, t in enumerate(times)]
+        tol_s = float(rng.choice([0.05, 0.1, 0.2, 0.3]))
+
+        expected = [h["i"] for h in _reference_deduplicate(hits, tol_s)]
+        assert [h["i"] for h in deduplicate_hits(hits, tol_s)] == expected, (times, tol_s)
@@ -0,0 +1,98 @@
+import json
+import os
+import random
+import sys
+from dataclasses import astuple
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+SERVER_SRC = ROOT / "apps" / "python" / "ableton_video_sync_server"
+for path in (ROOT, SERVER_SRC):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from music_video_generation.project_files import ProjectFiles
+
+CUE_PATHS = [
+    "/a/Start_A.wav",
+    "start_b.WAV",
+    None,
+    "",
+    "x/START_A.wav",
+    "/e/end_c.wav",
+    "/cues/end_c.wav",
+]
+CUE_REFS = [[], None, ["Start_A.wav"], ["END_C.wav", None, "end_c.wav"], ["start_b.wav"], ["/cues/START_B.wav"]]
+QUERIES = ["start_a.wav", "END_C.WAV", "start_b.wav", "/elsewhere/Start_A.wav", "a.wav", "zzz", ""]
+
+
+def _basename(path):
+    return os.path.basename(path).lower() if path else ""
+
+
+def _reference_recording(store, ref_id):
+    # linear scan: first recording with a start/end cue of the same basename
+    key = _basename(ref_id)
+    for rec in store.list_recordings():
+        if key and key in (_basename(rec.start_sound_path), _basename(rec.end_sound_path)):
+            return rec
+    return None
+
+
+def _reference_media(store, ref_id):
+    key = _basename(ref_id)
+    return [m for m in store.list_media() if key and key in {_basename(c) for c in m.cue_refs_used}]
+
+
+def _write_project(root, rng):
+    recordings = [
+        {
+            "project_name": f"p{j}",
+            "start_sound_path": rng.choice(CUE_PATHS),
+            "end_sound_path": rng.choice(CUE_PATHS),
+            "time_start_recording": 1,
+            "time_end_recording": rng.choice([0, 5]),
+        }
+        for j in range(rng.randint(0, 5))
+    ]
+    media = [
+        {"file": f"/m/{j}.mp4", "cue_refs_used": rng.choice(CUE_REFS), "duration_s": rng.choice([None, 3])}
+        for j in range(rng.randint(0, 5))
+    ]
+    (root / "recordings.json").write_text(json.dumps({"recordings": recordings}), encoding="utf-8")
+    (root / "postprocess_matches.json").write_text(json.dumps({"media": media}), encoding="utf-8")
+
+
+def _as_tuples(value):
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [astuple(item) for item in value]
+    return astuple(value)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_cue_lookups_match_linear_scan(tmp_path, seed):
+    rng = random.Random(seed)
+    for trial in range(20):
+        root = tmp_path / f"project_{trial}"
+        root.mkdir()
+        _write_project(root, rng)
+        store = ProjectFiles(root)
+
+        for query in QUERIES:
+            assert _as_tuples(store.find_recording_by_cue(query)) == _as_tuples(_reference_recording(store, query))
+            assert _as_tuples(store.find_media_by_cue(query)) == _as_tuples(_reference_media(store, query))
+
+
+def test_cue_lookup_needs_whole_basename(tmp_path):
+    (tmp_path / "recordings.json").write_text(
+        json.dumps({"recordings": [{"project_name": "p", "start_sound_path": "/cues/start_a.wav"}]}),
+        encoding="utf-8",
+    )
+    store = ProjectFiles(tmp_path)
+
+    assert store.find_recording_by_cue("START_A.wav").project_name == "p"
+    assert store.find_recording_by_cue("a.wav") is None
@@ -0,0 +1,63 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[4]
+SERVER_SRC = ROOT / "apps" / "python" / "ableton_video_sync_server"
+for path in (ROOT, SERVER_SRC):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+from music_video_generation.multi_video_generator.sync_models import (
+    AudioCueInfo,
+    CameraTake,
+    CueAnchor,
+    SyncRecording,
+)
+from music_video_generation.multi_video_generator.sync_sequence import _build_sync_sequence
+
+# Random scenarios with the clips and slot picks the original sort-based
+# _build_sync_sequence produced for them.
+BASELINE = json.loads((Path(__file__).parent / "data" / "sync_sequence_baseline.json").read_text(encoding="utf-8"))
+
+
+def _run(case):
+    rec = SyncRecording(**case["recording"])
+    audio = AudioCueInfo(
+        Path("/a.wav"),
+        case["audio"]["duration_s"],
+        CueAnchor(case["audio"]["cue_time_s"], "s"),
+        None,
+    )
+    takes = [
+        CameraTake(
+            Path(take["file"]),
+            take["window_start_s"],
+            take["window_end_s"],
+            CueAnchor(take["anchor_s"], "s"),
+            None,
+            take["index"],
+        )
+        for take in case["takes"]
+    ]
+    try:
+        clips, plan = _build_sync_sequence(rec, audio, takes, **case["kwargs"])
+    except ValueError as exc:
+        return {"error": str(exc)}
+    return {
+        "clips": [
+            [c.time_global, c.duration, c.video.filename, getattr(c.video, "kind", None), c.inpoint, c.outpoint]
+            for c in clips
+        ],
+        "segments": [
+            [s["camera_take_index"], s["score"], s["camera_mapping_kind"]] for s in plan["segments"]
+        ],
+    }
+
+
+@pytest.mark.parametrize("case", BASELINE, ids=range(len(BASELINE)))
+def test_build_sync_sequence_matches_baseline(case):
+    # round-trip through JSON so floats compare exactly and tuples become lists
+    assert json.loads(json.dumps(_run(case))) == case["expected"]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple, List
 
@@ -7,7 +9,7 @@ import wave
 import numpy as np
 import matplotlib.pyplot as plt  # if you do not use this here, you can remove it
 
-from scipy.signal import butter, filtfilt, fftconvolve, stft
+from scipy.signal import butter, oaconvolve, sosfiltfilt, stft
 
 
 DEFAULT_FS = 48_000
@@ -26,6 +28,12 @@ def fade(signal: np.ndarray, ms: int = DEFAULT_FADE_MS, fs: int = DEFAULT_FS) ->
     return data
 
 
+@lru_cache(maxsize=8)
+def _bandpass_sos(low: float, high: float, order: int = 3) -> np.ndarray:
+    # low/high are normalized to Nyquist; designed once per band
+    return butter(order, [low, high], btype="band", output="sos")
+
+
 def _bandpass(
     payload: np.ndarray,
     fs: int,
@@ -45,35 +53,89 @@ def _bandpass(
         # If something is weird with fs/band, just return payload unchanged.
         return payload.astype(np.float32)
 
-    b, a = butter(3, [low, high], btype="band")
-    return filtfilt(b, a, payload).astype(np.float32)
+    return sosfiltfilt(_bandpass_sos(low, high), payload).astype(np.float32)
 
 
-def read_wav_mono(path: str | Path, *, apply_bandpass: bool = True) -> tuple[np.ndarray, int]:
-    source = Path(path)
-    with wave.open(str(source), "rb") as handle:
-        fs = handle.getframerate()
-        channels = handle.getnchannels()
-        sample_width = handle.getsampwidth()
-        n_frames = handle.getnframes()
-        payload = handle.readframes(n_frames)
+def _decode_pcm_mono(payload: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """
+    Decode interleaved PCM to mono float32 in [-1, 1).
 
+    Channels are summed straight from the integer view into a single float32
+    array that is then offset/scaled in place, instead of materializing a
+    multi-channel float copy, a scaled copy and the channel mean.
+    """
     if sample_width == 1:
-        data = (np.frombuffer(payload, np.uint8).astype(np.float32) - 128.0) / 128.0
+        raw, offset, scale = np.frombuffer(payload, np.uint8), 128.0, 128.0
     elif sample_width == 2:
-        data = np.frombuffer(payload, np.int16).astype(np.float32) / 32768.0
+        raw, offset, scale = np.frombuffer(payload, np.int16), 0.0, 32768.0
     else:
-        data = np.frombuffer(payload, np.int32).astype(np.float32) / (2**31)
+        raw, offset, scale = np.frombuffer(payload, np.int32), 0.0, float(2**31)
 
     if channels > 1:
-        data = data.reshape(-1, channels).mean(axis=1)
+        data = raw.reshape(-1, channels).sum(axis=1, dtype=np.float32)
+    else:
+        data = raw.astype(np.float32)
+    if offset:
+        data -= offset * channels
+    data *= 1.0 / (scale * channels)
+    return data
+
+
+def _find_data_chunk(path: Path) -> tuple[int, int] | None:
+    """
+    Byte offset and size of the RIFF "data" chunk, or None if not found.
+    """
+    with open(path, "rb") as fh:
+        header = fh.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        while True:
+            chunk = fh.read(8)
+            if len(chunk) < 8:
+                return None
+            size = int.from_bytes(chunk[4:8], "little")
+            if chunk[:4] == b"data":
+                return fh.tell(), size
+            fh.seek(size + (size & 1), os.SEEK_CUR)  # chunks are word-aligned
+
+
+def _read_pcm(path: Path):
+    """
+    Return (payload, fs, channels, sample_width) for a PCM WAV.
+
+    The sample data is memory-mapped rather than read into one large bytes
+    object; decoding then streams through the OS page cache. Falls back to
+    wave.readframes for files whose data chunk cannot be mapped.
+    """
+    with wave.open(str(path), "rb") as handle:
+        fs = handle.getframerate()
+        channels = handle.getnchannels()
+        sample_width = handle.getsampwidth()
+        n_frames = handle.getnframes()
+        n_bytes = n_frames * channels * sample_width
+
+        chunk = _find_data_chunk(path) if n_bytes else None
+        if chunk is not None and chunk[1] >= n_bytes:
+            try:
+                payload = np.memmap(path, dtype=np.uint8, mode="r", offset=chunk[0], shape=(n_bytes,))
+            except (OSError, ValueError):
+                payload = handle.readframes(n_frames)
+        else:
+            payload = handle.readframes(n_frames)
+    return payload, fs, channels, sample_width
+
+
+def read_wav_mono(path: str | Path, *, apply_bandpass: bool = True) -> tuple[np.ndarray, int]:
+    source = Path(path)
+    payload, fs, channels, sample_width = _read_pcm(source)
 
-    data = data.astype(np.float32)
+    data = _decode_pcm_mono(payload, sample_width, channels)
+    del payload  # release the mapping before filtering
 
     if apply_bandpass and len(data):
         data = _bandpass(data, fs)
 
-    return data.astype(np.float32), fs
+    return data, fs
 
 
 def _compute_spectrogram(
@@ -160,11 +222,14 @@ def xcorr_valid(
     y: np.ndarray,
 ) -> np.ndarray:
     """
-    1D cross-correlation (valid mode) using FFT convolution.
+    1D cross-correlation (valid mode) using overlap-add FFT convolution.
 
     corr[k] = sum_n x[n + k] * y[n], with k such that y fully overlaps x.
 
     Assumes x is the longer array (recording) and y is the shorter (reference).
+    Overlap-add works in reference-sized blocks instead of one FFT over the
+    whole recording, which is faster and far lighter on memory for
+    minutes-long recordings vs. sub-second cues.
     """
     x = np.asarray(x, dtype=np.float32)
     y = np.asarray(y, dtype=np.float32)
@@ -172,9 +237,9 @@ def xcorr_valid(
     if x.size == 0 or y.size == 0:
         return np.zeros((0,), dtype=np.float32)
 
-    # fftconvolve with reversed y gives correlation
-    corr_full = fftconvolve(x, y[::-1], mode="valid")
-    return corr_full.astype(np.float32)
+    # convolution with reversed y gives correlation
+    corr_full = oaconvolve(x, y[::-1], mode="valid")
+    return corr_full.astype(np.float32, copy=False)
 
 
 __all__ = [
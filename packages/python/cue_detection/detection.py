@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Sequence
 
 from loguru import logger
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.fft import set_workers
+from scipy.signal import decimate
 
 from .audio import (
     _compute_spectrogram,
@@ -18,6 +25,25 @@ from .audio import (
 
 MEDIA_SAMPLE_RATE = DEFAULT_FS
 
+# Bump when gather_reference_library changes how it builds references, so
+# existing .cache_*.npz files in cue_refs directories are not reused.
+REF_CACHE_VERSION = 1
+
+# compute_matches correlates references concurrently (the FFTs release the
+# GIL). Each worker holds a recording-length correlation, so keep this small.
+MATCH_MAX_WORKERS = 4
+
+# pyplot keeps global state; debug plots from worker threads take turns.
+_PLOT_LOCK = threading.Lock()
+
+# Coarse-to-fine waveform search (coarse_factor > 1): lags whose decimated
+# correlation reaches this fraction of its max are re-evaluated at full rate.
+# Kept well below the 0.5 * max floor used for peak picking.
+COARSE_KEEP_FRACTION = 0.3
+# If more than this share of lags would need refinement (e.g. a reference that
+# is not in the recording, so the correlation is all noise), correlate fully.
+COARSE_MAX_COVERAGE = 0.25
+
 
 def classify_reference_name(name: str) -> str | None:
     lowered = name.lower()
@@ -28,6 +54,81 @@ def classify_reference_name(name: str) -> str | None:
     return None
 
 
+def _reference_cache_path(refs_dir: Path, include_common_prefix: bool) -> Path | None:
+    """
+    Cache file for the library built from refs_dir, keyed by the names,
+    mtimes and sizes of its WAVs; None if the directory cannot be listed.
+    """
+    try:
+        entries = sorted(
+            (wav.name, st.st_mtime_ns, st.st_size)
+            for wav in refs_dir.glob("*.wav")
+            for st in (wav.stat(),)
+        )
+    except OSError:
+        return None
+    key = hashlib.sha1(
+        repr((REF_CACHE_VERSION, include_common_prefix, entries)).encode("utf-8")
+    ).hexdigest()[:16]
+    # the include_common_prefix variant is part of the name, so the two
+    # variants of one directory can be cached side by side
+    return refs_dir / f".cache_{_cache_variant(include_common_prefix)}_{key}.npz"
+
+
+def _cache_variant(include_common_prefix: bool) -> str:
+    return "prefixed" if include_common_prefix else "plain"
+
+
+def _load_reference_cache(path: Path) -> Dict[str, List[Dict]] | None:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            ids = data["ids"].tolist()
+            kinds = data["kinds"].tolist()
+            offsets = data["offsets"].tolist()
+            samples = data["samples"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+    refs: Dict[str, List[Dict]] = {"start": [], "end": []}
+    for i, (ref_id, kind) in enumerate(zip(ids, kinds)):
+        refs[kind].append({"id": ref_id, "samples": samples[offsets[i] : offsets[i + 1]]})
+    return refs
+
+
+def _save_reference_cache(path: Path, refs: Dict[str, List[Dict]], include_common_prefix: bool) -> None:
+    flat = [(kind, ref) for kind in ("start", "end") for ref in refs[kind]]
+    lengths = [len(ref["samples"]) for _, ref in flat]
+    offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+    if flat:
+        samples = np.concatenate([np.asarray(ref["samples"], dtype=np.float32) for _, ref in flat])
+    else:
+        samples = np.zeros((0,), dtype=np.float32)
+
+    tmp: Path | None = None
+    try:
+        # unique temp name: concurrent postprocess workers may build the same cache
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        tmp = Path(tmp_name)
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(
+                fh,
+                ids=np.array([ref["id"] for _, ref in flat], dtype=str),
+                kinds=np.array([kind for kind, _ in flat], dtype=str),
+                offsets=offsets,
+                samples=samples,
+            )
+        os.replace(tmp, path)
+        # older caches of the same variant are stale (a WAV changed)
+        for stale in path.parent.glob(f".cache_{_cache_variant(include_common_prefix)}_*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError as exc:
+        # e.g. the bundled cue_refs directory is read-only
+        logger.warning("cue_detection: could not write reference cache %s: %s", path, exc)
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+
+
 def gather_reference_library(
     refs_dir: Path,
     *,
@@ -40,7 +141,26 @@ def gather_reference_library(
       - start.wav / end.wav are already stand-alone robust cues.
       - For purely coded-chirp workflows, you usually want include_common_prefix=False
         so custom refs are used as-is.
+
+    The built library is cached next to the WAVs (.cache_<hash>.npz) and
+    reused while none of them changes.
     """
+    refs_dir = Path(refs_dir)
+    cache_path = _reference_cache_path(refs_dir, include_common_prefix)
+    refs = _load_reference_cache(cache_path) if cache_path is not None and cache_path.exists() else None
+    if refs is None:
+        refs = _build_reference_library(refs_dir, include_common_prefix)
+        if cache_path is not None:
+            _save_reference_cache(cache_path, refs, include_common_prefix)
+    else:
+        print(f"[info] Loaded reference library from {cache_path.name}")
+
+    print(f"[info] Using start cues: {[r['id'] for r in refs['start']]}")
+    print(f"[info] Using end cues:   {[r['id'] for r in refs['end']]}")
+    return refs
+
+
+def _build_reference_library(refs_dir: Path, include_common_prefix: bool) -> Dict[str, List[Dict]]:
     refs: Dict[str, List[Dict]] = {"start": [], "end": []}
 
     start_common = end_common = None
@@ -125,9 +245,6 @@ def gather_reference_library(
 
     refs["start"] = _keep_recent(refs["start"])
     refs["end"] = _keep_recent(refs["end"])
-
-    print(f"[info] Using start cues: {[r['id'] for r in refs['start']]}")
-    print(f"[info] Using end cues:   {[r['id'] for r in refs['end']]}")
     return refs
 
 
@@ -170,12 +287,36 @@ def _plot_correlation_debug(
     out_dir = base_dir / "debug" / "cue_matches"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
-
     if t.size != corr.size:
         t = np.arange(len(corr), dtype=np.float32)
         t = t - t[0]
 
+    ref_slug = _slugify(ref_label)
+    rec_slug = _slugify(rec_label)
+
+    filename = (
+        f"corr_{ref_slug}_in_{rec_slug}"
+        f"_thr_{adaptive_thresh:.3f}"
+        f"_max_{max_corr:.3f}"
+        f"_peaks_{len(peak_indices)}.png"
+    )
+    out_path = out_dir / filename
+    with _PLOT_LOCK:
+        _draw_correlation(out_path, corr, t, adaptive_thresh, peak_indices)
+
+    print(f"[debug] Saved correlation debug plot to {out_path}")
+    return out_path
+
+
+def _draw_correlation(
+    out_path: Path,
+    corr: np.ndarray,
+    t: np.ndarray,
+    adaptive_thresh: float,
+    peak_indices: List[int],
+) -> None:
+    fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
+
     ax1 = axes[0]
     ax1.plot(t, corr, label="Correlation", linewidth=1.0)
     ax1.axhline(adaptive_thresh, linestyle="--", label="Adaptive threshold")
@@ -203,23 +344,9 @@ def _plot_correlation_debug(
     ax2.grid(True)
 
     plt.tight_layout()
-
-    ref_slug = _slugify(ref_label)
-    rec_slug = _slugify(rec_label)
-
-    filename = (
-        f"corr_{ref_slug}_in_{rec_slug}"
-        f"_thr_{adaptive_thresh:.3f}"
-        f"_max_{max_corr:.3f}"
-        f"_peaks_{len(peak_indices)}.png"
-    )
-    out_path = out_dir / filename
     fig.savefig(out_path, dpi=150)
     plt.close(fig)
 
-    print(f"[debug] Saved correlation debug plot to {out_path}")
-    return out_path
-
 
 # Public wrapper (you had this in __all__)
 def plot_find_all_matches(
@@ -257,13 +384,67 @@ def _normalize_for_corr(x: np.ndarray) -> np.ndarray:
     """
     if x.size == 0:
         return x.astype(np.float32)
+    # one float32 copy, centered and scaled in place
     x = x.astype(np.float32)
-    x = x - float(np.mean(x))
+    x -= float(np.mean(x))
     peak = float(np.max(np.abs(x)) + 1e-9)
-    x = x / peak
+    x /= peak
     return x
 
 
+def _normalized_ref(ref: Dict) -> np.ndarray:
+    """
+    Normalized samples of a reference-library entry.
+
+    Computed on first use and kept on the entry, so a job that matches one
+    library against many recordings prepares each reference only once.
+    """
+    cached = ref.get("_samples_norm")
+    if cached is None:
+        cached = ref["_samples_norm"] = _normalize_for_corr(np.asarray(ref["samples"]))
+    return cached
+
+
+def _decimate(x: np.ndarray, factor: int) -> np.ndarray:
+    return decimate(x, factor, ftype="fir", zero_phase=True).astype(np.float32, copy=False)
+
+
+def _xcorr_coarse_to_fine(
+    rec: np.ndarray,
+    ref: np.ndarray,
+    rec_lo: np.ndarray,
+    ref_lo: np.ndarray,
+    factor: int,
+) -> np.ndarray:
+    """
+    xcorr_valid(rec, ref), evaluated at full rate only around the lags where
+    the decimated correlation (rec_lo vs ref_lo) is promising; 0 elsewhere.
+    """
+    n_out = rec.size - ref.size + 1
+    coarse = xcorr_valid(rec_lo, ref_lo)
+    if n_out <= 0 or coarse.size == 0:
+        return xcorr_valid(rec, ref)
+    coarse_max = float(np.max(coarse))
+    if coarse_max <= 0.0:
+        return xcorr_valid(rec, ref)
+
+    # full-rate windows around each promising coarse lag, merged where they overlap
+    keep = np.flatnonzero(coarse >= COARSE_KEEP_FRACTION * coarse_max)
+    pad = 4 * factor
+    starts = np.maximum(keep * factor - pad, 0)
+    ends = np.minimum(keep * factor + pad + 1, n_out)
+    breaks = np.flatnonzero(starts[1:] > ends[:-1]) + 1
+    starts = starts[np.r_[0, breaks]]
+    ends = ends[np.r_[breaks - 1, ends.size - 1]]
+    if int(np.sum(ends - starts)) > COARSE_MAX_COVERAGE * n_out:
+        return xcorr_valid(rec, ref)
+
+    corr = np.zeros(n_out, dtype=np.float32)
+    for a, b in zip(starts.tolist(), ends.tolist()):
+        corr[a:b] = xcorr_valid(rec[a : b + ref.size - 1], ref)
+    return corr
+
+
 def find_all_matches(
     ref: np.ndarray,
     rec: np.ndarray,
@@ -278,6 +459,9 @@ def find_all_matches(
     rec_label: str = "rec",
     n_fft: int = 2048,
     hop_length: int = 512,
+    normalized: bool = False,
+    coarse_factor: int = 1,
+    rec_coarse: np.ndarray | None = None,
 ) -> List[tuple[int, float]]:
     """
     Find cue matches via cross-correlation, optionally visualize the correlation.
@@ -287,12 +471,24 @@ def find_all_matches(
       - correlation peak for a good match is close to 1.0
       - `threshold` is interpreted as a fraction of the *best* correlation
 
+    Pass normalized=True when ref and rec already went through
+    _normalize_for_corr (compute_matches does this once per recording).
+
+    coarse_factor > 1 (waveform mode) first correlates ref and rec decimated
+    by that factor and only computes the full-rate correlation around
+    promising lags, falling back to a full correlation when too many lags
+    qualify. The cue band (up to ~6.5 kHz) survives decimation by 3 at 48 kHz.
+    rec_coarse may pass rec already decimated by coarse_factor.
+
     Returns:
         List of (sample_index, corr_value).
     """
     # --- prepare signals: this is critical for robust detection ---
-    ref_norm = _normalize_for_corr(ref)
-    rec_norm = _normalize_for_corr(rec)
+    if normalized:
+        ref_norm, rec_norm = ref, rec
+    else:
+        ref_norm = _normalize_for_corr(ref)
+        rec_norm = _normalize_for_corr(rec)
 
     if use_spectrogram:
         logger.info(
@@ -315,11 +511,15 @@ def find_all_matches(
         mode_suffix = "spec"
     else:
         logger.info(f"find_all_matches: waveform correlation for {ref_label} in {rec_label}")
-        corr = xcorr_valid(rec_norm, ref_norm)
-        if corr.size:
-            t_axis = np.arange(corr.size, dtype=np.float32) / fs
+        if coarse_factor > 1:
+            if rec_coarse is None:
+                rec_coarse = _decimate(rec_norm, coarse_factor)
+            corr = _xcorr_coarse_to_fine(
+                rec_norm, ref_norm, rec_coarse, _decimate(ref_norm, coarse_factor), coarse_factor
+            )
         else:
-            t_axis = np.zeros((0,), dtype=np.float32)
+            corr = xcorr_valid(rec_norm, ref_norm)
+        t_axis = None  # sample-rate time axis, only built for the debug plot
         nms = int(max(1, round(min_sep_s * fs)))
         idx_to_samples = 1
         mode_suffix = "wave"
@@ -341,28 +541,32 @@ def find_all_matches(
     frac = float(np.clip(threshold, 0.0, 1.0))
     adaptive_thresh = max(frac * max_corr, max_corr * 0.5)
 
+    # Greedy NMS: from the first sample above threshold take the max of the
+    # next nms samples, then resume at the first above-threshold sample at
+    # least nms past that peak. Only the above-threshold indices are visited.
     peak_indices: List[int] = []
-    i = 0
-    L = len(corr)
-
-    while i < L:
-        if corr[i] >= adaptive_thresh:
-            j_end = min(L, i + nms)
-            j = i + int(np.argmax(corr[i:j_end]))
-            peak_indices.append(j)
-            i = j + nms
-        else:
-            i += 1
+    above = np.flatnonzero(corr >= adaptive_thresh)
+    k = 0
+    while k < above.size:
+        i = int(above[k])
+        j = i + int(np.argmax(corr[i : i + nms]))
+        peak_indices.append(j)
+        k = int(np.searchsorted(above, j + nms))
 
     # Map correlation indices back to sample indices
-    peaks: List[tuple[int, float]] = [
-        (idx * idx_to_samples, float(corr[idx])) for idx in peak_indices
-    ]
+    peaks: List[tuple[int, float]] = list(
+        zip(
+            [idx * idx_to_samples for idx in peak_indices],
+            corr[peak_indices].tolist(),  # one gather instead of a float() per peak
+        )
+    )
 
     if len(peaks) == 0 or len(peaks) > 2:
         print(f"[debug] peaks={len(peaks)}, max_corr={max_corr:.3f}, mode={mode_suffix}")
 
     if debug_plot:
+        if t_axis is None:
+            t_axis = np.arange(corr.size, dtype=np.float32) / fs
         _plot_correlation_debug(
             corr=corr,
             t=t_axis,
@@ -378,14 +582,32 @@ def find_all_matches(
 
 
 def deduplicate_hits(hits: Sequence[Dict], tol_s: float = 0.2) -> List[Dict]:
+    """
+    Keep the earliest hit, then the next one more than tol_s after the last
+    kept hit, and so on. Time order, ties in input order.
+    """
     if not hits:
         return []
-    ordered = sorted(hits, key=lambda h: h["time_s"])
-    deduped = [ordered[0]]
-    for hit in ordered[1:]:
-        if abs(hit["time_s"] - deduped[-1]["time_s"]) > tol_s:
-            deduped.append(hit)
-    return deduped
+    times = np.fromiter((h["time_s"] for h in hits), dtype=np.float64, count=len(hits))
+    order = np.argsort(times, kind="stable")
+    t = times[order]
+
+    keep = [0]
+    n = t.size
+    k = 0
+    while True:
+        # first index with t[j] - t[k] > tol_s; searchsorted on t[k] + tol_s can
+        # be off by rounding, so nudge it to match the subtraction exactly
+        j = int(np.searchsorted(t, t[k] + tol_s, side="right"))
+        while j < n and t[j] - t[k] <= tol_s:
+            j += 1
+        while j - 1 > k and t[j - 1] - t[k] > tol_s:
+            j -= 1
+        if j >= n:
+            break
+        keep.append(j)
+        k = j
+    return [hits[i] for i in order[keep].tolist()]
 
 
 def compute_matches(
@@ -393,6 +615,8 @@ def compute_matches(
     refs: Dict[str, List[Dict]],
     threshold: float,
     min_gap_s: float,
+    *,
+    coarse_factor: int = 1,
 ) -> Dict[str, List[Dict]]:
     """
     Compute all start/end matches for a given recording.
@@ -400,13 +624,26 @@ def compute_matches(
     For the new coded-chirp cues, recommended:
       - threshold ~ 0.3–0.6
       - min_gap_s >= cue_length (e.g., 0.4 for 0.25–0.3 s cues)
+
+    coarse_factor enables the coarse-to-fine search of find_all_matches
+    (e.g. 3 at 48 kHz); the default 1 correlates every lag at full rate.
     """
     results = {"start": [], "end": []}
-    for kind, ref_list in refs.items():
-        for ref in ref_list:
-            hits = find_all_matches(
-                ref["samples"],
-                rec,
+    # the recording is shared by every reference: normalize it once
+    rec_norm = _normalize_for_corr(np.asarray(rec))
+    rec_coarse = _decimate(rec_norm, coarse_factor) if coarse_factor > 1 else None
+    tasks = [(kind, ref) for kind, ref_list in refs.items() for ref in ref_list]
+
+    workers = min(len(tasks), MATCH_MAX_WORKERS, os.cpu_count() or 1)
+    # cores left over by the reference threads go to the FFTs of each one
+    # (scipy.fft's worker setting is per thread)
+    fft_workers = max(1, (os.cpu_count() or 1) // max(1, workers))
+
+    def match(ref: Dict) -> List[tuple[int, float]]:
+        with set_workers(fft_workers):
+            return find_all_matches(
+                _normalized_ref(ref),
+                rec_norm,
                 threshold,
                 min_gap_s,
                 fs=MEDIA_SAMPLE_RATE,
@@ -415,18 +652,31 @@ def compute_matches(
                 project_dir=None,
                 ref_label=ref["id"],
                 rec_label="recording",
+                normalized=True,
+                coarse_factor=coarse_factor,
+                rec_coarse=rec_coarse,
+            )
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            all_hits = list(pool.map(match, (ref for _, ref in tasks)))
+    else:
+        all_hits = [match(ref) for _, ref in tasks]
+
+    # merged in reference order, as in a serial run
+    for (kind, ref), hits in zip(tasks, all_hits):
+        for idx, score in hits:
+            results[kind].append(
+                {
+                    "time_s": idx / MEDIA_SAMPLE_RATE,
+                    "score": score,
+                    "ref_id": ref["id"],
+                }
             )
-            for idx, score in hits:
-                results[kind].append(
-                    {
-                        "time_s": idx / MEDIA_SAMPLE_RATE,
-                        "score": score,
-                        "ref_id": ref["id"],
-                    }
-                )
+    # deduplicate_hits sorts by time (stable) itself; 0-1 hits need neither
     for kind, entries in results.items():
-        entries.sort(key=lambda h: h["time_s"])
-        results[kind] = deduplicate_hits(entries)
+        if len(entries) > 1:
+            results[kind] = deduplicate_hits(entries)
     return results
 
 
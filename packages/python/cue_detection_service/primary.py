@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import tempfile
 import threading
 import time
 from datetime import UTC, datetime
@@ -10,12 +9,11 @@ from typing import Dict, List, Optional
 from loguru import logger
 
 from music_video_generation.postprocessing.audio_utils import (
-    extract_audio_48k,
     get_media_duration,
     has_ffmpeg,
-    read_wav_mono,
+    read_media_mono,
 )
-from music_video_generation.postprocessing.config import FS, MIN_GAP_S, THRESHOLD
+from music_video_generation.postprocessing.config import COARSE_FACTOR, FS, MIN_GAP_S, THRESHOLD
 
 try:
     from cue_detection import build_segments, compute_matches
@@ -240,13 +238,12 @@ class PrimaryCueDetectionService:
         """
         t0 = time.perf_counter()
 
-        with tempfile.TemporaryDirectory() as td:
-            tmp = Path(td) / "audio.wav"
-            extract_audio_48k(str(file_path), tmp)
-            rec, _fs = read_wav_mono(tmp)
+        rec, _fs = read_media_mono(file_path)
 
         duration = get_media_duration(str(file_path)) or len(rec) / FS
-        matches = compute_matches(rec, primary_refs, params["threshold"], params["min_gap_s"])
+        matches = compute_matches(
+            rec, primary_refs, params["threshold"], params["min_gap_s"], coarse_factor=COARSE_FACTOR
+        )
 
         start_hits = matches.get("start", []) or []
         raw_end_hits = matches.get("end", []) or []
@@ -4,7 +4,7 @@ from .constants import (
     DEFAULT_REF_DIR,
     DEFAULT_SAMPLE_RATE,
 )
-from .io import save_wav, stereo_to_pcm, to_stereo
+from .io import mono_to_pcm, save_wav, stereo_to_pcm, to_stereo
 from .library import CueLibrary, CueRender
 from .signals import barker_bpsk, end_cue, fade, start_cue, stop_cue, unique_cue
 
@@ -23,5 +23,6 @@ __all__ = [
     "fade",
     "to_stereo",
     "stereo_to_pcm",
+    "mono_to_pcm",
     "save_wav",
 ]
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import wave
 from pathlib import Path
+from typing import Iterable
 
 import numpy as np
 
@@ -11,13 +12,40 @@ from .constants import DEFAULT_PEAK_DB, DEFAULT_SAMPLE_RATE, db_to_linear
 
 def to_stereo(mono: np.ndarray, peak_db: float = DEFAULT_PEAK_DB) -> np.ndarray:
     gain = db_to_linear(peak_db)
-    payload = np.clip(np.asarray(mono, dtype=np.float32) * gain, -1.0, 1.0)
-    return np.column_stack((payload, payload))
+    payload = np.asarray(mono, dtype=np.float32) * gain
+    np.clip(payload, -1.0, 1.0, out=payload)
+    # fill both channels of one C-contiguous buffer (sounddevice needs it contiguous)
+    stereo = np.empty((payload.shape[0], 2), dtype=np.float32)
+    stereo[:, 0] = payload
+    stereo[:, 1] = payload
+    return stereo
 
 
 def stereo_to_pcm(stereo: np.ndarray) -> bytes:
+    # clip allocates a fresh buffer, so it can be scaled in place
     payload = np.clip(np.asarray(stereo, dtype=np.float32), -1.0, 1.0)
-    return (payload * 32767).astype(np.int16).tobytes()
+    payload *= 32767
+    return payload.astype(np.int16).tobytes()
+
+
+def mono_to_pcm(mono: np.ndarray, peak_db: float = DEFAULT_PEAK_DB, gains: Iterable[float] = ()) -> bytes:
+    """
+    Same bytes as stereo_to_pcm(to_stereo(mono, peak_db)) with each gain then
+    applied and clipped in turn, but scaled and cast on the mono signal; only
+    the final int16 samples are duplicated into the two channels.
+    """
+    payload = np.asarray(mono, dtype=np.float32) * db_to_linear(peak_db)
+    np.clip(payload, -1.0, 1.0, out=payload)
+    for gain in gains:
+        if gain != 1.0:
+            payload *= float(gain)
+            np.clip(payload, -1.0, 1.0, out=payload)
+    payload *= 32767
+    samples = payload.astype(np.int16)
+    pcm = np.empty((samples.shape[0], 2), dtype=np.int16)
+    pcm[:, 0] = samples
+    pcm[:, 1] = samples
+    return pcm.tobytes()
 
 
 def save_wav(path: str | os.PathLike[str], stereo: np.ndarray, *, fs: int = DEFAULT_SAMPLE_RATE) -> Path:
@@ -32,4 +60,4 @@ def save_wav(path: str | os.PathLike[str], stereo: np.ndarray, *, fs: int = DEFA
     return Path(path)
 
 
-__all__ = ["save_wav", "stereo_to_pcm", "to_stereo"]
+__all__ = ["mono_to_pcm", "save_wav", "stereo_to_pcm", "to_stereo"]
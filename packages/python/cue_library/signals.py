@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import time
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -13,16 +14,40 @@ from .constants import DEFAULT_FADE_MS, DEFAULT_SAMPLE_RATE
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=32)
+def _ramp(n: int) -> np.ndarray:
+    """
+    Read-only linear 0..1 fade ramp of n samples (cached; only a few fade
+    lengths are ever used).
+    """
+    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    ramp.setflags(write=False)
+    return ramp
+
+
+def _time_axis(n: int, duration_s: float) -> np.ndarray:
+    # same values as np.linspace(0, duration_s, n, endpoint=False, dtype=np.float32),
+    # without linspace's generic start/stop/endpoint handling
+    return (np.arange(n) * (duration_s / n)).astype(np.float32)
+
+
 def fade(signal: np.ndarray, ms: int = DEFAULT_FADE_MS, fs: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
     """
     Apply symmetric fade-in / fade-out to a mono signal.
     """
-    arr = np.array(signal, dtype=np.float32, copy=True)
+    return _fade_inplace(np.array(signal, dtype=np.float32, copy=True), ms=ms, fs=fs)
+
+
+def _fade_inplace(arr: np.ndarray, ms: int = DEFAULT_FADE_MS, fs: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """
+    fade() on a float32 buffer the caller owns; the generators below use it
+    on freshly built arrays to skip the defensive copy.
+    """
     if arr.size == 0:
         return arr
     n = max(1, int(ms * fs / 1000))
     n = min(n, arr.size)
-    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+    ramp = _ramp(n)
     arr[:n] *= ramp
     arr[-n:] *= ramp[::-1]
     return arr
@@ -51,7 +76,7 @@ def _linear_chirp(
     Band-limited linear chirp from f0 to f1 over duration_s seconds.
     """
     n = int(fs * duration_s)
-    t = np.linspace(0.0, duration_s, n, endpoint=False, dtype=np.float32)
+    t = _time_axis(n, duration_s)
     k = (f1 - f0) / duration_s
     phase = 2.0 * np.pi * (f0 * t + 0.5 * k * t * t)
     return np.sin(phase).astype(np.float32)
@@ -93,7 +118,7 @@ def _coded_chirp(
     chirp = _linear_chirp(f0=f0, f1=f1, duration_s=duration_s, fs=fs)
     pn = _pn_sequence(seed=seed, length=code_length)
     coded = _apply_pn(chirp, pn)
-    coded = fade(coded, ms=fade_ms, fs=fs)
+    coded = _fade_inplace(coded, ms=fade_ms, fs=fs)
 
     peak = float(np.max(np.abs(coded)) + 1e-6)
     coded = (coded / peak).astype(np.float32)
@@ -149,7 +174,7 @@ def stop_cue(
     guard = np.zeros(int(guard_s * fs), dtype=np.float32)
 
     cue = np.concatenate([guard, core, guard])
-    cue = fade(cue, ms=DEFAULT_FADE_MS * 2, fs=fs)
+    cue = _fade_inplace(cue, ms=DEFAULT_FADE_MS * 2, fs=fs)
     peak = float(np.max(np.abs(cue)) + 1e-6)
     cue = (cue / peak).astype(np.float32)
     return cue
@@ -189,13 +214,15 @@ def barker_bpsk(
         dtype=np.float32,
     )
     chip_n = max(1, int(round(fs * (chip_ms / 1000.0))))
-    t_chip = np.linspace(0.0, chip_ms / 1000.0, chip_n, endpoint=False, dtype=np.float32)
+    t_chip = _time_axis(chip_n, chip_ms / 1000.0)
     carrier = np.sin(2 * np.pi * carrier_hz * t_chip).astype(np.float32)
 
-    payload = np.concatenate([(bit * carrier) for bit in barker]).astype(np.float32)
-    payload = fade(payload, ms=DEFAULT_FADE_MS, fs=fs)
+    # chip i = barker[i] * carrier, written row by row into one buffer
+    payload = np.outer(barker, carrier).ravel()
+    payload = _fade_inplace(payload, ms=DEFAULT_FADE_MS, fs=fs)
     peak = float(np.max(np.abs(payload)) + 1e-6)
-    return (payload / peak).astype(np.float32)
+    payload /= peak
+    return payload
 
 
 __all__ = [
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import ctypes
+import io
+import logging
 import os
 import platform
+import queue
 import threading
-import time
 import wave
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
 import numpy as np
 
@@ -20,7 +23,7 @@ try:
         to_stereo,
         unique_cue,
     )
-    from cue_library.io import stereo_to_pcm
+    from cue_library.io import mono_to_pcm, stereo_to_pcm
 except ImportError:  # pragma: no cover - workspace fallback
     from packages.python.cue_library import (
         DEFAULT_REF_DIR,
@@ -30,7 +33,7 @@ except ImportError:  # pragma: no cover - workspace fallback
         to_stereo,
         unique_cue,
     )
-    from packages.python.cue_library.io import stereo_to_pcm
+    from packages.python.cue_library.io import mono_to_pcm, stereo_to_pcm
 
 FS = DEFAULT_SAMPLE_RATE
 REF_DIR = DEFAULT_REF_DIR
@@ -39,6 +42,48 @@ IS_WINDOWS = platform.system() == "Windows"
 _user32 = ctypes.windll.user32 if IS_WINDOWS else None
 BACKEND_ENV = os.environ.get("CUE_BACKEND", "").lower().strip() or None
 
+logger = logging.getLogger(__name__)
+
+_JOBS_LOCK = threading.Lock()
+
+
+def _wav_bytes(pcm: bytes, samplerate: int) -> bytes:
+    """16-bit stereo WAV file image of pcm, for winsound.SND_MEMORY."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(samplerate)
+        wf.writeframes(pcm)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=128)
+def _seed_cue(seed: int, dur: float) -> np.ndarray:
+    """
+    unique_cue for play_seed. Seeds repeat (e.g. per bar), so the waveform is
+    synthesized once; the cached array is read-only.
+    """
+    mono = unique_cue(seed, length=dur)
+    mono.setflags(write=False)
+    return mono
+
+
+@lru_cache(maxsize=16)
+def _barker_cue(chip_ms: float, carrier_hz: float, fs: int) -> np.ndarray:
+    mono = mk_barker_bpsk(chip_ms=chip_ms, carrier_hz=carrier_hz, fs=fs)
+    mono.setflags(write=False)
+    return mono
+
+
+def _run_jobs(jobs: "queue.SimpleQueue[Callable[[], None]]") -> None:
+    while True:
+        job = jobs.get()
+        try:
+            job()
+        except Exception:
+            logger.exception("Cue playback failed")
+
 
 @dataclass
 class CuePlayer:
@@ -51,6 +96,7 @@ class CuePlayer:
     sa = None
     winsound = None
     fs_out = FS
+    _jobs = None
 
     @classmethod
     def instance(cls) -> "CuePlayer":
@@ -92,37 +138,63 @@ class CuePlayer:
     def play(self, stereo: np.ndarray, samplerate: int = FS) -> None:
         payload = np.asarray(stereo, dtype=np.float32)
         if self.master_gain != 1.0:
-            payload = np.clip(payload * float(self.master_gain), -1.0, 1.0)
+            # the product is a new buffer (the caller's array stays untouched); clip it in place
+            payload = payload * float(self.master_gain)
+            np.clip(payload, -1.0, 1.0, out=payload)
+        self._output(payload, samplerate)
+
+    def _output(self, payload: np.ndarray, samplerate: int) -> None:
         if self.backend_name == "sounddevice":
             self.sd.play(payload, samplerate=samplerate, blocking=True, device=self.device_index)
-        elif self.backend_name == "simpleaudio":
-            pcm = stereo_to_pcm(payload)
+        else:
+            self._play_pcm(stereo_to_pcm(payload), samplerate)
+
+    def _play_pcm(self, pcm: bytes, samplerate: int) -> None:
+        if self.backend_name == "simpleaudio":
             self.sa.WaveObject(pcm, num_channels=2, bytes_per_sample=2, sample_rate=samplerate).play().wait_done()
         elif self.backend_name == "winsound":
-            pcm = stereo_to_pcm(payload)
-            tmp = os.path.join(REF_DIR, f"_tmp_{time.time_ns()}.wav")
-            os.makedirs(REF_DIR, exist_ok=True)
-            with wave.open(tmp, "wb") as wf:
-                wf.setnchannels(2)
-                wf.setsampwidth(2)
-                wf.setframerate(samplerate)
-                wf.writeframes(pcm)
-            self.winsound.PlaySound(tmp, self.winsound.SND_FILENAME)
+            # SND_MEMORY plays from a RIFF buffer (synchronously; winsound has no async memory playback)
+            self.winsound.PlaySound(_wav_bytes(pcm, samplerate), self.winsound.SND_MEMORY)
         else:
             raise RuntimeError("No valid backend loaded.")
 
+    def _play_mono(self, mono: np.ndarray, samplerate: int, gain: float) -> None:
+        # per-call gain and master_gain are applied as one factor and clipped once
+        total_gain = float(gain) * float(self.master_gain)
+        if self.backend_name in ("simpleaudio", "winsound"):
+            # PCM backends: go straight from the mono cue to interleaved int16
+            self._play_pcm(mono_to_pcm(mono, gains=(total_gain,)), samplerate)
+            return
+        stereo = to_stereo(mono)
+        if total_gain != 1.0:
+            stereo *= total_gain
+            np.clip(stereo, -1.0, 1.0, out=stereo)
+        self._output(stereo, samplerate)
+
+    def _submit(self, job: Callable[[], None]) -> None:
+        """
+        Queue a non-blocking cue. One daemon thread per player drains the queue,
+        so cues play in order without starting a thread per cue.
+
+        Cues never overlap or cut each other off: one submitted while another
+        is playing starts only after it (and anything queued before it) has
+        finished. Callers that need a marker at an exact moment should not
+        fire it while a previous cue may still be playing.
+        """
+        with _JOBS_LOCK:
+            if self._jobs is None:
+                self._jobs = queue.SimpleQueue()
+                threading.Thread(target=_run_jobs, args=(self._jobs,), name="cue-player", daemon=True).start()
+        self._jobs.put(job)
+
     def play_seed(self, seed: int, dur: float = 0.5, blocking: bool = False, gain: float = 1.0) -> None:
         def _job() -> None:
-            mono = unique_cue(seed, length=dur)
-            stereo = to_stereo(mono)
-            if gain != 1.0:
-                stereo = np.clip(stereo * float(gain), -1.0, 1.0)
-            self.play(stereo)
+            self._play_mono(_seed_cue(seed, dur), FS, gain)
 
         if blocking:
             _job()
         else:
-            threading.Thread(target=_job, daemon=True).start()
+            self._submit(_job)
 
     def play_barker(
         self,
@@ -132,16 +204,12 @@ class CuePlayer:
         blocking: bool = True,
     ) -> None:
         def _job() -> None:
-            mono = mk_barker_bpsk(chip_ms=chip_ms, carrier_hz=carrier_hz, fs=self.fs_out)
-            stereo = to_stereo(mono)
-            if gain != 1.0:
-                stereo = np.clip(stereo * float(gain), -1.0, 1.0)
-            self.play(stereo, samplerate=self.fs_out)
+            self._play_mono(_barker_cue(chip_ms, carrier_hz, self.fs_out), self.fs_out, gain)
 
         if blocking:
             _job()
         else:
-            threading.Thread(target=_job, daemon=True).start()
+            self._submit(_job)
 
 
 __all__ = ["CuePlayer", "unique_cue", "mk_barker_bpsk", "to_stereo", "fade", "FS"]
@@ -26,6 +26,7 @@ class AudioOutputSelector:
         "monitor",
         "tv",
     ]
+    _SCREEN_RE = re.compile("|".join(map(re.escape, SCREEN_KEYWORDS)), re.IGNORECASE)
 
     def __init__(self) -> None:
         if sd is None:
@@ -35,8 +36,13 @@ class AudioOutputSelector:
             self.hostapi_names = [api["name"].lower() for api in sd.query_hostapis()]
         except Exception:
             self.hostapi_names = []
+        # self.devices is a snapshot, so the output list is built once from it
+        self._outputs = self._build_outputs()
 
     def list_outputs(self) -> List[Dict]:
+        return list(self._outputs)
+
+    def _build_outputs(self) -> List[Dict]:
         outputs: List[Dict] = []
         for idx, device in enumerate(self.devices):
             if device.get("max_output_channels", 0) <= 0:
@@ -60,9 +66,8 @@ class AudioOutputSelector:
         return defaults[1]
 
     def get_screen_output_index(self) -> Optional[int]:
-        pattern = re.compile("|".join(self.SCREEN_KEYWORDS), re.IGNORECASE)
-        for device in self.list_outputs():
-            if pattern.search(device.get("name", "")):
+        for device in self._outputs:
+            if self._SCREEN_RE.search(device.get("name", "")):
                 return device.get("index")
         return None
 